@@ -0,0 +1,66 @@
+"""
+Per-operation cost of the cache backends, and whether workers share entries.
+
+Run from the project root:
+    python -m benchmarks.bench_cache [--iterations 50000] [--value-bytes 2048] [--workers 4]
+
+The shared memory cache uses a temporary file, not the one of a running app.
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from src.config import Config
+from src.utils.cache import LocalCache, SharedMemoryCache
+
+def shared_cache(path):
+    return SharedMemoryCache(path, Config.CACHE_SLOTS, Config.CACHE_SLOT_KB * 1024, Config.CACHE_WAYS, Config.CACHE_LOCK_STRIPES)
+
+def measure(function, iterations):
+    """Average microseconds per call"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        function(i)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def fill_and_read(args):
+    """Worker: set its own keys, then count how many keys of the other workers it can read"""
+    path, worker, workers, keys = args
+    cache = shared_cache(path)
+    for i in range(keys):
+        cache.set(f"worker{worker}:{i}", b"x" * 64)
+    time.sleep(0.5)  # Let the other workers write
+    return sum(
+        cache.get(f"worker{other}:{i}") is not None
+        for other in range(workers) if other != worker
+        for i in range(keys)
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--value-bytes", type=int, default=2048)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    value = os.urandom(args.value_bytes)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench-cache")
+        backends = {"local": LocalCache(Config.CACHE_LOCAL_ENTRIES), "shared": shared_cache(path)}
+
+        print(f"{'backend':<8} {'set us':>8} {'get hit us':>11} {'get miss us':>12}")
+        for name, cache in backends.items():
+            set_us = measure(lambda i: cache.set(f"key{i % 500}", value), args.iterations)
+            hit_us = measure(lambda i: cache.get(f"key{i % 500}"), args.iterations)
+            miss_us = measure(lambda i: cache.get(f"missing{i}"), args.iterations)
+            print(f"{name:<8} {set_us:>8.2f} {hit_us:>11.2f} {miss_us:>12.2f}")
+
+        keys = 200
+        with multiprocessing.get_context("fork").Pool(args.workers) as pool:
+            seen = pool.map(fill_and_read, [(path, worker, args.workers, keys) for worker in range(args.workers)])
+        expected = keys * (args.workers - 1)
+        print(f"\nShared across {args.workers} processes: each read {min(seen)}-{max(seen)} of {expected} keys written by the others")
+
+if __name__ == "__main__":
+    main()
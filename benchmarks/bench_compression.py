@@ -0,0 +1,94 @@
+"""
+CPU time against bytes saved for each response encoding and level.
+
+Run from the project root:
+    python -m benchmarks.bench_compression [--projects 100] [--users 500] [--iterations 50]
+
+Payloads mimic a full `GET /projects/?limit=100` page and a `GET /users/` dump.
+The "cached" column is the cost of serving the same body again from the
+compressed body cache (digest + lookup instead of compressing).
+"""
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta, timezone
+from src.utils import compression
+
+STATUSES = ["not-started", "in-progress", "completed"]
+
+def project_page(count):
+    now = datetime.now(timezone.utc)
+    projects = [
+        {
+            "id": f"65f1c0ffee{i:014d}",
+            "name": f"Project {i} - website redesign",
+            "description": "Refresh the landing page, blog templates and pricing table for the new brand.",
+            "dueDate": (date.today() + timedelta(days=i % 60)).isoformat(),
+            "status": STATUSES[i % 3],
+            "imageId": f"projects/cover_{i}",
+            "imageUrl": f"https://res.cloudinary.com/demo/image/upload/v1700000000/projects/cover_{i}.jpg",
+            "owner": {"id": f"65f1beef{i % 7:016d}", "name": f"Owner {i % 7}", "email": f"owner{i % 7}@example.com"},
+            "createdAt": (now - timedelta(days=i)).isoformat(),
+            "updatedAt": now.isoformat(),
+        }
+        for i in range(count)
+    ]
+    return {
+        "projects": projects,
+        "pagination": {"total": 1000, "limit": count, "skip": 0, "hasMore": True},
+        "sorting": {"field": "dueDate", "order": "asc"},
+    }
+
+def users_dump(count):
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {"id": f"65f1beef{i:016d}", "name": f"User {i}", "email": f"user{i}@example.com", "createdAt": now, "updatedAt": now}
+        for i in range(count)
+    ]
+
+def measure(function, data, iterations):
+    """Average CPU seconds per call"""
+    start = time.process_time()
+    for _ in range(iterations):
+        function(data)
+    return (time.process_time() - start) / iterations
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    payloads = {
+        f"projects x{args.projects}": json.dumps(project_page(args.projects)).encode(),
+        f"users x{args.users}": json.dumps(users_dump(args.users)).encode(),
+    }
+
+    installed = compression.available_encoders()
+    levels = {"gzip": [1, 6, 9]}
+    if "br" in installed:
+        levels["br"] = [1, 4, 6, 11]
+    if "zstd" in installed:
+        levels["zstd"] = [1, 3, 9]
+    functions = {"gzip": compression._gzip, "br": compression._brotli, "zstd": compression._zstd}
+
+    for name, data in payloads.items():
+        print(f"\n{name}: {len(data):,} bytes uncompressed")
+        print(f"{'encoding':<10} {'level':>5} {'bytes':>10} {'saved':>7} {'cpu ms':>8} {'cached ms':>10} {'KB saved/cpu ms':>16}")
+        for encoding, encoding_levels in levels.items():
+            for level in encoding_levels:
+                encoders = {encoding: (functions[encoding], level)}
+                body = functions[encoding](data, level)
+                cpu = measure(lambda d: functions[encoding](d, level), data, args.iterations)
+                compression.compress_body(data, encoding, encoders)  # Fill the cache
+                cached = measure(lambda d: compression.compress_body(d, encoding, encoders), data, args.iterations)
+                saved = len(data) - len(body)
+                print(f"{encoding:<10} {level:>5} {len(body):>10,} {saved / len(data):>6.0%} "
+                      f"{cpu * 1000:>8.3f} {cached * 1000:>10.3f} {saved / 1024 / max(cpu * 1000, 1e-6):>16.1f}")
+
+    if "br" not in installed or "zstd" not in installed:
+        print("\nInstall 'brotli' and 'zstandard' to benchmark (and serve) br and zstd")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Import-time profile of the application (what a cold start or a recycled
+non-preloaded worker pays before serving its first request).
+
+Run from the project root:
+    python -m benchmarks.bench_import_time [--runs 11] [--top 20] [--min-saving-ms 10]
+
+Imports the app in fresh interpreters, alternating between the app as shipped
+(`import src.app`) and a baseline measured in the same run, where the lazily
+loaded dependencies are imported eagerly first (as the app used to). Prints the
+slowest modules by cumulative time and exits with status 1 if a lazily loaded
+dependency is imported at startup, or if startup isn't at least --min-saving-ms
+cheaper than the baseline. The fastest run of each variant is compared: other load
+on the machine only ever adds time, and it moves medians by tens of milliseconds.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+TARGET_MODULE = "src.app"
+
+# Dependencies that must only load on first use: Cloudinary (see src/utils/cloudinary_client.py)
+# and the optional compressors (see src/utils/compression.py)
+# Pillow is not listed: mongoengine.fields imports it for ImageField
+LAZY_MODULES = ["cloudinary", "brotli", "zstandard"]
+
+# What the baseline imports before the app (what file_route.py and compression.py imported at load time)
+EAGER_IMPORTS = ["cloudinary.uploader", "cloudinary.api", "brotli", "zstandard"]
+
+# The eager imports measured 17-34ms on top of the app here (fastest of 11 runs), so requiring
+# 10ms fails when most of the saving is lost without failing on noise
+DEFAULT_MIN_SAVING_MS = float(os.getenv("IMPORT_TIME_MIN_SAVING_MS", "10"))
+
+def parse_importtime(stderr):
+    """
+    Parse -X importtime output into {module: (self_us, cumulative_us, depth)}
+    Lines look like: 'import time:       431 |     176022 |   flask'
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(parts[0]), int(parts[1]), depth)
+    return modules
+
+def total_ms(profile):
+    """Time spent in all top-level imports of a run"""
+    return sum(cumulative_us for _, cumulative_us, depth in profile.values() if depth == 0) / 1000
+
+def profile_once(eager=False):
+    """Import the app in a fresh interpreter and return the parsed profile"""
+    # Optional packages that aren't installed are left out of the baseline
+    code = f"import {TARGET_MODULE}"
+    if eager:
+        code = ("import importlib\n"
+                f"for name in {EAGER_IMPORTS!r}:\n"
+                "    try: importlib.import_module(name)\n"
+                "    except ImportError: pass\n") + code
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        raise SystemExit(f"❌ Importing {TARGET_MODULE} failed")
+    return parse_importtime(result.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=11)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--min-saving-ms", type=float, default=DEFAULT_MIN_SAVING_MS)
+    args = parser.parse_args()
+
+    # Warm the bytecode cache so runs measure imports, not compilation
+    profile_once(eager=True)
+    # Alternate the two variants so drift on the machine affects both alike
+    profiles, baselines = [], []
+    for _ in range(args.runs):
+        profiles.append(profile_once())
+        baselines.append(profile_once(eager=True))
+
+    totals_ms = [total_ms(profile) for profile in profiles]
+    baseline_totals_ms = [total_ms(profile) for profile in baselines]
+    app_self_ms = statistics.median(profile[TARGET_MODULE][0] / 1000 for profile in profiles)
+    last = profiles[-1]
+
+    print(f"{'module':<50} {'self ms':>10} {'cumulative ms':>14}")
+    slowest = sorted(last.items(), key=lambda item: item[1][1], reverse=True)
+    top_level = [(name, times) for name, times in slowest if times[2] <= 2][:args.top]
+    for name, (self_us, cumulative_us, depth) in top_level:
+        print(f"{'  ' * depth + name:<50} {self_us / 1000:>10.1f} {cumulative_us / 1000:>14.1f}")
+
+    saving_ms = min(baseline_totals_ms) - min(totals_ms)
+    print(f"\nStartup imports over {args.runs} runs: fastest {min(totals_ms):.1f}ms, "
+          f"median {statistics.median(totals_ms):.1f}ms ({TARGET_MODULE} itself {app_self_ms:.1f}ms)")
+    print(f"Eager baseline: fastest {min(baseline_totals_ms):.1f}ms, "
+          f"median {statistics.median(baseline_totals_ms):.1f}ms")
+    print(f"Saving (fastest runs): {saving_ms:.1f}ms, required {args.min_saving_ms:.0f}ms")
+
+    failures = []
+    eager = [module for module in LAZY_MODULES if module in last]
+    if eager:
+        failures.append(f"lazily loaded modules imported at startup: {', '.join(eager)}")
+    if saving_ms < args.min_saving_ms:
+        failures.append(f"startup is only {saving_ms:.1f}ms cheaper than the eager baseline "
+                        f"(required {args.min_saving_ms:.0f}ms)")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        raise SystemExit(1)
+    print("✅ Startup cheaper than the eager baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Parity check and benchmark of the compiled validators against marshmallow.
+
+Run from the project root:
+    python -m benchmarks.bench_schemas [--iterations 20000]
+
+Exits with status 1 if the compiled schemas return different data or errors.
+"""
+import argparse
+import copy
+import timeit
+from marshmallow import ValidationError
+from src.schemas.auth_schema import UserRegisterSchema, UserLoginSchema
+from src.schemas.compiled import CompiledSchema
+from src.schemas.project_schema import ProjectInputSchema
+
+VALID_PROJECT = {
+    "name": "  Website Redesign  ",
+    "description": "New landing page and blog",
+    "dueDate": "2025-12-31",
+    "status": "in-progress",
+    "imageId": "projects/abc123",
+    "imageUrl": "https://res.cloudinary.com/demo/image/upload/projects/abc123.jpg"
+}
+
+PROJECT_CASES = [
+    VALID_PROJECT,
+    {"name": "API", "dueDate": "2025-01-01", "status": "completed"},
+    {"name": "AP", "dueDate": "2025-01-01", "status": "done"},
+    {"name": "x" * 101, "description": "y" * 501, "dueDate": "31/12/2025", "status": "not-started"},
+    {"name": None, "dueDate": None, "status": None},
+    {"name": 42, "dueDate": 20251231, "status": ["completed"]},
+    {"name": "Valid name", "dueDate": "", "status": "completed", "description": None, "imageId": None},
+    {"name": "Valid name", "dueDate": "2025-02-30", "status": "completed", "extra": True},
+    {"name": "Valid name", "dueDate": "2025-02-28", "status": "completed", "owner": "abc"},
+    {"name": "Valid name", "dueDate": "2025-02-28T10:00:00", "status": "completed"},
+    {},
+]
+
+REGISTER_CASES = [
+    {"name": " John Doe ", "email": " John@Example.com ", "password": "password123"},
+    {"name": "J0hn", "email": "not-an-email", "password": "short"},
+    {"name": "", "email": "", "password": ""},
+    {"name": None, "email": None, "password": None},
+    {"name": "Jane", "email": 5, "password": 12345678},
+    {"name": "Jane", "email": "jane@localhost", "password": "onlyletters", "role": "admin"},
+    {},
+]
+
+LOGIN_CASES = [
+    {"email": "john@example.com", "password": "password123"},
+    {"email": "JOHN@EXAMPLE.COM ", "password": " password123 "},
+    {"email": "john@", "password": "12345678"},
+    {"email": "john@example.com"},
+    {},
+]
+
+SCHEMAS = [
+    ("ProjectInputSchema", ProjectInputSchema, PROJECT_CASES, VALID_PROJECT),
+    ("UserRegisterSchema", UserRegisterSchema, REGISTER_CASES, REGISTER_CASES[0]),
+    ("UserLoginSchema", UserLoginSchema, LOGIN_CASES, LOGIN_CASES[0]),
+]
+
+def load_outcome(schema, payload):
+    """Return ('ok', data), ('error', messages) or ('exception', type) for one load"""
+    try:
+        return ("ok", schema.load(copy.deepcopy(payload)))
+    except ValidationError as err:
+        return ("error", err.messages)
+    except Exception as err:
+        # e.g. the @pre_load hooks calling strip() on non-string values
+        return ("exception", type(err).__name__)
+
+def check_parity():
+    """Compare compiled and marshmallow results for every case"""
+    failures = 0
+    for name, schema_class, cases, _ in SCHEMAS:
+        schema = schema_class()
+        compiled = CompiledSchema(schema_class())
+        for payload in cases:
+            expected = load_outcome(schema, payload)
+            actual = load_outcome(compiled, payload)
+            if expected != actual:
+                failures += 1
+                print(f"❌ {name} mismatch for {payload!r}")
+                print(f"   marshmallow: {expected!r}")
+                print(f"   compiled:    {actual!r}")
+        print(f"✅ {name}: {len(cases)} cases checked")
+    return failures
+
+def benchmark(iterations):
+    """Time valid and invalid loads with both backends"""
+    print(f"\n{'schema':<20} {'case':<8} {'marshmallow':>14} {'compiled':>14} {'speedup':>8}")
+    for name, schema_class, cases, valid_payload in SCHEMAS:
+        schema = schema_class()
+        compiled = CompiledSchema(schema_class())
+        for label, payload in (("valid", valid_payload), ("invalid", cases[2])):
+            timings = []
+            for backend in (schema, compiled):
+                def run():
+                    try:
+                        backend.load(dict(payload))
+                    except ValidationError:
+                        pass
+                timings.append(min(timeit.repeat(run, number=iterations, repeat=3)) / iterations)
+            marshmallow_us, compiled_us = (t * 1e6 for t in timings)
+            print(f"{name:<20} {label:<8} {marshmallow_us:>12.2f}us {compiled_us:>12.2f}us {marshmallow_us / compiled_us:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    failures = check_parity()
+    benchmark(args.iterations)
+    if failures:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
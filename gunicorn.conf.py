@@ -10,7 +10,8 @@ backlog = 2048
 
 # Worker processes
 workers = int(os.getenv('WORKERS', '2'))  # Increased default for production
-worker_class = "sync"
+worker_class = os.getenv('WORKER_CLASS', 'sync')  # gthread or gevent for concurrent requests per worker
+threads = int(os.getenv('THREADS', '1'))  # Used by gthread workers
 worker_connections = 1000
 timeout = 30
 keepalive = 2
@@ -47,5 +48,17 @@ raw_env = [
 # Preload application for better performance
 preload_app = True
 
+def when_ready(server):
+    """
+    Load the lazily imported dependencies in the master before workers fork,
+    so no worker pays for them on its first request (this moves the cost to
+    master startup, it doesn't remove it)
+    """
+    if preload_app:
+        from src.utils.cloudinary_client import warm_up
+        from src.utils.compression import available_encoders
+        warm_up()
+        available_encoders()
+
 # Enable auto-restart when code changes (development only)
 reload = os.getenv('FLASK_ENV', 'production') == 'development'
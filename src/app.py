@@ -4,6 +4,9 @@ from mongoengine import connect
 from src.routes import user_routes, project_routes, file_route
 from src.config import Config
 from src.utils.error_handlers import register_error_handlers
+from src.commands import register_commands
+from src.utils.compression import register_compression
+from src.utils.query_profiler import slow_query_recorder
 
 app = Flask(__name__)
 app.config.from_object(Config)
@@ -21,11 +24,21 @@ CORS(app,
 # Disable strict slashes to prevent redirects
 app.url_map.strict_slashes = False
 
-connect(host=app.config["MONGODB_URI"])
+# Record slow queries (with their shape and plan) into the capped slow_queries collection
+connect(
+    host=app.config["MONGODB_URI"],
+    event_listeners=[slow_query_recorder] if Config.SLOW_QUERY_ENABLED else []
+)
 
 # Register comprehensive error handlers from utils
 register_error_handlers(app)
 
+# Compress JSON responses (gzip, plus brotli/zstd when installed)
+register_compression(app)
+
+# Register maintenance CLI commands
+register_commands(app)
+
 @app.route('/')
 def hello():
     return {"message": "Hello! Welcome to the Project Space API"}
@@ -0,0 +1,55 @@
+import click
+from src.utils.project_stats import rebuild_project_stats
+from src.utils.owner_snapshots import backfill_owner_snapshots
+from src.utils.archive import archive_projects
+from src.utils.query_profiler import top_slow_query_shapes
+from src.utils.image_variants import backfill_image_variants
+
+def register_commands(app):
+    """Register maintenance CLI commands with the Flask app (run with `flask --app src.app <command>`)"""
+
+    @app.cli.command("rebuild-project-stats")
+    def rebuild_project_stats_command():
+        """Recompute the materialized project stats summary"""
+        summary = rebuild_project_stats()
+        click.echo(f"✅ Project stats rebuilt: {summary['total']} projects")
+
+    @app.cli.command("backfill-owner-snapshots")
+    @click.option("--batch-size", default=500, show_default=True, help="Projects per bulk write")
+    def backfill_owner_snapshots_command(batch_size):
+        """Add the embedded owner snapshot to existing projects"""
+        updated = backfill_owner_snapshots(batch_size=batch_size)
+        click.echo(f"✅ Owner snapshots added to {updated} projects")
+
+    @app.cli.command("backfill-image-variants")
+    @click.option("--batch-size", default=500, show_default=True, help="Projects per bulk write")
+    def backfill_image_variants_command(batch_size):
+        """Add (or refresh) responsive image variant URLs on existing projects"""
+        updated = backfill_image_variants(batch_size=batch_size)
+        click.echo(f"✅ Image variants updated on {updated} projects")
+
+    @app.cli.command("archive-projects")
+    @click.option("--days", type=int, default=None, help="Archive projects not updated for this many days (default: ARCHIVE_AFTER_DAYS)")
+    @click.option("--status", "statuses", multiple=True, help="Status to archive, repeatable (default: ARCHIVE_STATUSES)")
+    @click.option("--batch-size", type=int, default=None, help="Projects per bulk write (default: ARCHIVE_BATCH_SIZE)")
+    def archive_projects_command(days, statuses, batch_size):
+        """Move old projects from projects to projects_archive"""
+        moved = archive_projects(older_than_days=days, statuses=list(statuses) or None, batch_size=batch_size)
+        click.echo(f"✅ Archived {moved} projects")
+
+    @app.cli.command("slow-queries")
+    @click.option("--limit", default=20, show_default=True, help="Number of query shapes to show")
+    @click.option("--hours", default=24, show_default=True, help="Only include queries recorded in the last hours")
+    def slow_queries_command(limit, hours):
+        """Show the recorded query shapes that spent the most time"""
+        shapes = top_slow_query_shapes(limit=limit, since_hours=hours)
+        if not shapes:
+            click.echo("✅ No slow queries recorded")
+            return
+        for shape in shapes:
+            plan = shape.get('plan') or {}
+            click.echo(
+                f"🐢 {shape['collectionName']}: {shape['count']}x, avg {shape['avgMs']:.1f}ms, "
+                f"max {shape['maxMs']:.1f}ms, plan: {plan.get('plan') or plan.get('error') or 'n/a'}"
+            )
+            click.echo(f"   {shape['shape']}")
@@ -8,6 +8,102 @@ class Config:
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "jwt-secret-key")
     JWT_EXPIRATION_DAYS = int(os.getenv("JWT_EXPIRATION_DAYS", "7"))
     
+    # Admin users (comma separated emails), e.g. allowed to use ?explain=1
+    ADMIN_EMAILS = [email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()]
+
+    # Token revocation settings (per worker Bloom filter, see src/utils/token_denylist.py)
+    TOKEN_DENYLIST_REFRESH_SECONDS = int(os.getenv("TOKEN_DENYLIST_REFRESH_SECONDS", "5"))
+    TOKEN_DENYLIST_REBUILD_SECONDS = int(os.getenv("TOKEN_DENYLIST_REBUILD_SECONDS", "3600"))
+    TOKEN_DENYLIST_CAPACITY = int(os.getenv("TOKEN_DENYLIST_CAPACITY", "100000"))
+    TOKEN_DENYLIST_ERROR_RATE = float(os.getenv("TOKEN_DENYLIST_ERROR_RATE", "0.001"))
+
+    # Read routing settings (per route read preference, see src/utils/read_routing.py)
+    # Modes: primary, primaryPreferred, secondary, secondaryPreferred, nearest
+    READ_PREFERENCES = {
+        'list_projects': os.getenv("READ_PREFERENCE_LIST_PROJECTS", "secondaryPreferred"),
+        'get_project': os.getenv("READ_PREFERENCE_GET_PROJECT", "secondaryPreferred"),
+        'list_users': os.getenv("READ_PREFERENCE_LIST_USERS", "secondaryPreferred"),
+        'project_stats': os.getenv("READ_PREFERENCE_PROJECT_STATS", "secondaryPreferred"),
+        'export_projects': os.getenv("READ_PREFERENCE_EXPORT_PROJECTS", "secondaryPreferred"),
+    }
+    READ_MAX_STALENESS_SECONDS = int(os.getenv("READ_MAX_STALENESS_SECONDS", "90"))  # MongoDB minimum is 90
+    # After a write the caller reads from the primary until any secondary it could be routed to
+    # has caught up: the staleness bound plus the driver's 10s heartbeat (its staleness estimate lags by up to one)
+    STICKY_PRIMARY_SECONDS = max(
+        int(os.getenv("STICKY_PRIMARY_SECONDS", "100")),
+        READ_MAX_STALENESS_SECONDS + 10
+    )
+    
+    # Input validation backend: 'compiled' (fast path, see src/schemas/compiled.py) or 'marshmallow'
+    SCHEMA_VALIDATION_BACKEND = os.getenv("SCHEMA_VALIDATION_BACKEND", "compiled")
+    
+    # Project stats settings
+    # When enabled, /projects/stats reads the incremental summary instead of aggregating
+    PROJECT_STATS_MATERIALIZED = os.getenv("PROJECT_STATS_MATERIALIZED", "false").lower() == "true"
+    PROJECT_STATS_TOP_OWNERS = int(os.getenv("PROJECT_STATS_TOP_OWNERS", "50"))
+    
+    # Archive settings (hot/cold tiering, see src/utils/archive.py)
+    ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+    ARCHIVE_STATUSES = [status.strip() for status in os.getenv("ARCHIVE_STATUSES", "completed").split(",")]
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+    
+    # NDJSON export/import settings
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))  # Documents per cursor batch
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))  # Documents per insert_many
+    # An import runs inside one request: it stops after IMPORT_MAX_SECONDS (below the gunicorn
+    # timeout) and reports how far it got; bodies are capped to what fits in that time
+    IMPORT_MAX_SECONDS = int(os.getenv("IMPORT_MAX_SECONDS", "20"))
+    IMPORT_MAX_CONTENT_LENGTH = int(os.getenv("IMPORT_MAX_CONTENT_IN_MB", "50")) * 1024 * 1024
+    IMPORT_MAX_LINE_BYTES = 64 * 1024
+    IMPORT_MAX_ERRORS = 1000  # Errors reported in the response (all are counted)
+    
+    # Request coalescing for GET /projects/ (see src/utils/singleflight.py)
+    SINGLEFLIGHT_ENABLED = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+    SINGLEFLIGHT_GRACE_MS = int(os.getenv("SINGLEFLIGHT_GRACE_MS", "0"))  # Reuse a finished result this long
+    SINGLEFLIGHT_WAIT_SECONDS = int(os.getenv("SINGLEFLIGHT_WAIT_SECONDS", "10"))  # Then run the query alone
+    
+    # Slow-query recorder settings (see src/utils/query_profiler.py)
+    SLOW_QUERY_ENABLED = os.getenv("SLOW_QUERY_ENABLED", "true").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS = int(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+    SLOW_QUERY_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_SAMPLE_RATE", "1.0"))  # Fraction of slow queries recorded
+    SLOW_QUERY_COLLECTION_MB = int(os.getenv("SLOW_QUERY_COLLECTION_MB", "16"))  # Capped collection size
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS = int(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", "300"))  # Per query shape
+    SLOW_QUERY_QUEUE_SIZE = 1000
+    
+    # Server-sent events settings (GET /projects/stream)
+    # Streams need a gthread or gevent worker (same WORKER_CLASS / THREADS as gunicorn.conf.py)
+    WORKER_CLASS = os.getenv("WORKER_CLASS", "sync")
+    THREADS = int(os.getenv("THREADS", "1"))
+    SSE_MAX_STREAMS_PER_WORKER = int(os.getenv("SSE_MAX_STREAMS_PER_WORKER", "100"))  # Thread pools: at most THREADS - 1
+    SSE_MAX_STREAM_SECONDS = int(os.getenv("SSE_MAX_STREAM_SECONDS", "25"))  # Below the gunicorn timeout
+    SSE_HEARTBEAT_SECONDS = int(os.getenv("SSE_HEARTBEAT_SECONDS", "10"))
+    SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", "1000"))
+    SSE_REPLAY_BUFFER_SIZE = int(os.getenv("SSE_REPLAY_BUFFER_SIZE", "500"))
+    SSE_SUBSCRIBER_QUEUE_SIZE = int(os.getenv("SSE_SUBSCRIBER_QUEUE_SIZE", "100"))
+    
+    # Response compression settings (see src/utils/compression.py)
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # Bytes
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_LEVEL = int(os.getenv("COMPRESSION_BROTLI_LEVEL", "4"))
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+    COMPRESSION_CACHE_TTL_SECONDS = int(os.getenv("COMPRESSION_CACHE_TTL_SECONDS", "300"))  # 0 disables
+    
+    # Cache settings (see src/utils/cache.py)
+    # 'shared': one memory-mapped cache for all workers on the host, 'local': per worker
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "shared")
+    CACHE_SHARED_PATH = os.getenv("CACHE_SHARED_PATH", "")  # Default: /dev/shm/project-space-cache
+    # Default file: 64 bytes + 1536 x 32KB = 48MB, well under Docker's default 64MB /dev/shm
+    CACHE_SLOTS = int(os.getenv("CACHE_SLOTS", "1536"))
+    CACHE_SLOT_KB = int(os.getenv("CACHE_SLOT_KB", "32"))  # Largest cached value (minus key)
+    CACHE_WAYS = 8  # Slots per bucket
+    CACHE_LOCK_STRIPES = 64
+    CACHE_LOCAL_ENTRIES = int(os.getenv("CACHE_LOCAL_ENTRIES", "1024"))
+    CACHE_DEFAULT_TTL_SECONDS = int(os.getenv("CACHE_DEFAULT_TTL_SECONDS", "300"))
+    IMAGE_INFO_CACHE_TTL_SECONDS = int(os.getenv("IMAGE_INFO_CACHE_TTL_SECONDS", "3600"))
+    # 0 disables; pages are cached compressed and must fit in CACHE_SLOT_KB (~2KB per 50 projects)
+    PROJECT_LIST_CACHE_TTL_SECONDS = int(os.getenv("PROJECT_LIST_CACHE_TTL_SECONDS", "0"))
+    
     # Environment-aware cookie settings
     IS_PRODUCTION = os.getenv("FLASK_ENV", "development") == "production"
     COOKIE_SECURE = IS_PRODUCTION
@@ -28,3 +124,22 @@ class Config:
     MAX_CONTENT_LENGTH = MAX_CONTENT_IN_MB * 1024 * 1024  # Convert to bytes for Flask
     UPLOAD_FOLDER = 'projects'
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+    UPLOAD_TRANSFORMATION = [
+        {'width': 1600, 'height': 900, 'crop': 'fill'},
+        {'quality': 'auto:good'}
+    ]
+    # Cloudinary accepts a signed upload for one hour after its timestamp
+    UPLOAD_SIGNATURE_TTL_SECONDS = 3600
+    
+    # Responsive image variants, generated by Cloudinary at upload time (see src/utils/image_variants.py)
+    # IMAGE_VARIANTS format: name:widthxheight, comma separated
+    IMAGE_VARIANTS = {
+        name.strip(): tuple(int(size) for size in dimensions.split("x"))
+        for name, dimensions in (
+            variant.split(":") for variant in
+            os.getenv("IMAGE_VARIANTS", "thumb:320x180,card:640x360,hero:1600x900").split(",") if variant.strip()
+        )
+    }
+    IMAGE_VARIANT_FORMATS = [image_format.strip() for image_format in os.getenv("IMAGE_VARIANT_FORMATS", "avif,webp").split(",") if image_format.strip()]
+    IMAGE_VARIANT_QUALITY = os.getenv("IMAGE_VARIANT_QUALITY", "auto")
+    IMAGE_EAGER_ASYNC = os.getenv("IMAGE_EAGER_ASYNC", "true").lower() == "true"
@@ -1,7 +1,24 @@
-from mongoengine import Document, StringField, DateField, DateTimeField, ReferenceField
+from mongoengine import (
+    Document, EmbeddedDocument, StringField, DateField, DateTimeField, ReferenceField, EmbeddedDocumentField,
+    DictField
+)
 from datetime import datetime, timezone
 from .user import User
 
+class OwnerSnapshot(EmbeddedDocument):
+    """Copy of the owner's public fields, so project reads don't need to load the user"""
+    id = StringField(required=True)
+    name = StringField()
+    email = StringField()
+    updatedAt = DateTimeField()  # The user's updatedAt when copied, so an older copy never overwrites a newer one
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(id=str(user.id), name=user.name, email=user.email, updatedAt=user.updatedAt)
+
+    def to_json(self):
+        return {"id": self.id, "name": self.name, "email": self.email}
+
 class Project(Document):
     name = StringField(required=True, max_length=100)
     description = StringField(required=False, max_length=500)
@@ -9,12 +26,21 @@ class Project(Document):
     status = StringField(required=True, choices=["not-started", "in-progress", "completed"])
     imageId = StringField(required=False, max_length=100)
     imageUrl = StringField(required=False, max_length=200)
+    imageVariants = DictField(required=False)  # {name: {width, height, <format>: url}}
     owner = ReferenceField(User, required=False)
+    ownerSnapshot = EmbeddedDocumentField(OwnerSnapshot, required=False)
     createdAt = DateTimeField(default=lambda: datetime.now(timezone.utc))
     updatedAt = DateTimeField(default=lambda: datetime.now(timezone.utc))
+    archivedAt = DateTimeField(required=False)  # Set when moved to the archive collection
 
     meta = {
-        'collection': 'projects'
+        'collection': 'projects',
+        'indexes': [
+            'dueDate',
+            'owner',
+            # Covers the /projects/stats aggregation (status, due date and owner only)
+            ('status', 'dueDate', 'owner')
+        ]
     }
 
     def save(self, *args, **kwargs):
@@ -23,6 +49,35 @@ class Project(Document):
         self.updatedAt = datetime.now(timezone.utc)
         return super(Project, self).save(*args, **kwargs)
 
+    def owner_id(self):
+        """Get the owner id as a string without dereferencing the owner"""
+        owner = self._data.get('owner')
+        if owner is None:
+            return None
+        return str(getattr(owner, 'id', owner))
+
+    def owner_json(self):
+        """
+        Get the owner's id, name and email from the embedded snapshot
+        Falls back to loading the owner for projects created before snapshots
+        """
+        if self.ownerSnapshot:
+            return self.ownerSnapshot.to_json()
+        if self.owner:
+            return OwnerSnapshot.from_user(self.owner).to_json()
+        return None
+
+    def image_srcset(self):
+        """Build srcset strings per format from the image variants, e.g. {"webp": "url 320w, url 640w"}"""
+        if not self.imageVariants:
+            return None
+        srcset = {}
+        for variant in sorted(self.imageVariants.values(), key=lambda variant: variant.get('width', 0)):
+            for image_format, url in variant.items():
+                if image_format not in ('width', 'height'):
+                    srcset.setdefault(image_format, []).append(f"{url} {variant['width']}w")
+        return {image_format: ", ".join(entries) for image_format, entries in srcset.items()}
+
     def to_json(self):
         return {
             "id": str(self.id), 
@@ -32,11 +87,10 @@ class Project(Document):
             "status": self.status, 
             "imageId": self.imageId, 
             "imageUrl": self.imageUrl,
-            "owner": {
-                "id": str(self.owner.id),
-                "name": self.owner.name,
-                "email": self.owner.email
-            } if self.owner else None,
+            "imageVariants": self.imageVariants or None,
+            "imageSrcset": self.image_srcset(),
+            "owner": self.owner_json(),
             "createdAt": self.createdAt.isoformat() if self.createdAt else None,
-            "updatedAt": self.updatedAt.isoformat() if self.updatedAt else None
+            "updatedAt": self.updatedAt.isoformat() if self.updatedAt else None,
+            "archivedAt": self.archivedAt.isoformat() if self.archivedAt else None
         }
@@ -0,0 +1,18 @@
+from mongoengine import Document, StringField, DictField, IntField, DateTimeField
+from datetime import datetime, timezone
+
+class ProjectStats(Document):
+    """
+    Materialized project summary, kept up to date incrementally by the
+    project create/update/delete routes (see src/utils/project_stats.py)
+    """
+    id = StringField(primary_key=True)
+    total = IntField(default=0)
+    byStatus = DictField()        # status -> count
+    byOwner = DictField()         # owner id -> count
+    openDueDates = DictField()    # ISO due date -> count of projects not completed
+    updatedAt = DateTimeField(default=lambda: datetime.now(timezone.utc))
+
+    meta = {
+        'collection': 'project_stats'
+    }
@@ -0,0 +1,17 @@
+from mongoengine import Document, StringField, DateTimeField
+from datetime import datetime, timezone
+
+class RevokedToken(Document):
+    jti = StringField(required=True, unique=True)
+    expiresAt = DateTimeField(required=True)
+    # Set by the MongoDB server on revoke ($currentDate), the denylist refresh watermark
+    createdAt = DateTimeField(default=lambda: datetime.now(timezone.utc))
+
+    meta = {
+        'collection': 'revoked_tokens',
+        'indexes': [
+            # MongoDB removes each entry once the token it revokes has expired
+            {'fields': ['expiresAt'], 'expireAfterSeconds': 0},
+            'createdAt'
+        ]
+    }
@@ -0,0 +1,21 @@
+from mongoengine import Document, StringField, FloatField, IntField, DictField, DateTimeField
+from datetime import datetime, timezone
+from src.config import Config
+
+class SlowQuery(Document):
+    command = StringField(required=True)
+    database = StringField()
+    collectionName = StringField()
+    shape = StringField()  # Normalized command as JSON (values replaced with "?")
+    shapeHash = StringField()
+    durationMs = FloatField()
+    nReturned = IntField()
+    plan = DictField()  # Plan summary from explain (reads only)
+    recordedAt = DateTimeField(default=lambda: datetime.now(timezone.utc))
+
+    meta = {
+        'collection': 'slow_queries',
+        # Capped: the oldest entries are dropped once the collection is full
+        'max_size': Config.SLOW_QUERY_COLLECTION_MB * 1024 * 1024,
+        'indexes': ['shapeHash', 'recordedAt']
+    }
@@ -0,0 +1,15 @@
+from mongoengine import Document, StringField, IntField, ReferenceField, DateTimeField
+from datetime import datetime, timezone
+from .user import User
+
+class Upload(Document):
+    """Image uploaded directly to Cloudinary by a browser and confirmed by the API"""
+    publicId = StringField(required=True, unique=True, max_length=100)
+    version = IntField(required=True)
+    format = StringField(required=False, max_length=10)
+    owner = ReferenceField(User, required=True)
+    createdAt = DateTimeField(default=lambda: datetime.now(timezone.utc))
+
+    meta = {
+        'collection': 'uploads'
+    }
@@ -13,10 +13,18 @@ class User(Document):
     }
 
     def save(self, *args, **kwargs):
+        # Projects embed the owner's name and email, refresh them when those change
+        snapshot_changed = self.pk is not None and bool({'name', 'email'} & set(self._get_changed_fields()))
+        
         if not self.createdAt:
             self.createdAt = datetime.now(timezone.utc)
         self.updatedAt = datetime.now(timezone.utc)
-        return super(User, self).save(*args, **kwargs)
+        result = super(User, self).save(*args, **kwargs)
+        
+        if snapshot_changed:
+            from src.utils.owner_snapshots import schedule_owner_snapshot_refresh
+            schedule_owner_snapshot_refresh(self)
+        return result
 
     def to_json(self):
         return {
@@ -1,24 +1,20 @@
 from flask import Blueprint, request, jsonify
 from werkzeug.utils import secure_filename
-import cloudinary
-import cloudinary.uploader
-import cloudinary.api
 from PIL import Image
 import os
+import time
+import uuid
 import urllib.parse
+from datetime import datetime, timezone
 from src.config import Config
+from src.models.upload import Upload
 from src.utils.auth import token_required
+from src.utils.cloudinary_client import get_cloudinary, get_uploader, get_api
+from src.utils.cache import get_cache
+from src.utils.image_variants import eager_upload_options, eager_upload_params, image_variants
 
 bp = Blueprint("files", __name__, url_prefix="/files")
 
-# Configure Cloudinary
-cloudinary.config(
-    cloud_name=Config.CLOUDINARY_CLOUD_NAME,
-    api_key=Config.CLOUDINARY_API_KEY,
-    api_secret=Config.CLOUDINARY_API_SECRET,
-    secure=True
-)
-
 def allowed_file(filename):
     """Check if the file extension is allowed"""
     return '.' in filename and \
@@ -87,10 +83,9 @@ def upload_image(_):
         # Prepare upload options
         upload_options = {
             'folder': folder,
-            'transformation': [
-                {'width': 1600, 'height': 900, 'crop': 'fill'},
-                {'quality': 'auto:good'}
-            ]
+            'transformation': Config.UPLOAD_TRANSFORMATION,
+            # Generate the responsive variants now, so no client triggers a cold transformation
+            **eager_upload_options()
         }
         
         # Add public_id if provided
@@ -98,18 +93,119 @@ def upload_image(_):
             upload_options['public_id'] = f"{folder}/{secure_filename(public_id)}"
         
         # Upload to Cloudinary
-        result = cloudinary.uploader.upload(file, **upload_options)
+        result = get_uploader().upload(file, **upload_options)
         
         # Return success response
         return jsonify({
             "imageId": result['public_id'],
             "imageUrl": result['secure_url'],
+            "imageVariants": image_variants(result['public_id']),
             "createdAt": result['created_at']
         }), 201
         
     except Exception as err:
         return jsonify({"error": f"Upload failed: {str(err)}"}), 500
 
+@bp.route("/upload-signature", methods=["POST"])
+@token_required
+def get_upload_signature(current_user):
+    """
+    Get signed parameters for uploading an image directly to Cloudinary
+    Folder, transformation, eager variants and allowed formats are pinned by the signature
+    Requires authentication
+    """
+    try:
+        cloudinary = get_cloudinary()
+        timestamp = int(time.time())
+        
+        # Public ids start with the user id so only the uploader can confirm them
+        params = {
+            'timestamp': timestamp,
+            'folder': Config.UPLOAD_FOLDER,
+            'public_id': f"{current_user.id}_{uuid.uuid4().hex}",
+            'transformation': cloudinary.utils.generate_transformation_string(
+                transformation=Config.UPLOAD_TRANSFORMATION
+            )[0],
+            'allowed_formats': ','.join(sorted(Config.ALLOWED_EXTENSIONS)),
+            **eager_upload_params()
+        }
+        signature = cloudinary.utils.api_sign_request(params, Config.CLOUDINARY_API_SECRET)
+        
+        return jsonify({
+            "uploadUrl": f"https://api.cloudinary.com/v1_1/{Config.CLOUDINARY_CLOUD_NAME}/image/upload",
+            "params": {
+                **params,
+                "api_key": Config.CLOUDINARY_API_KEY,
+                "signature": signature
+            },
+            "expiresAt": timestamp + Config.UPLOAD_SIGNATURE_TTL_SECONDS
+        }), 200
+        
+    except Exception as err:
+        return jsonify({"error": f"Failed to sign upload: {str(err)}"}), 500
+
+@bp.route("/confirm", methods=["POST"])
+@token_required
+def confirm_upload(current_user):
+    """
+    Confirm an image uploaded directly to Cloudinary
+    Body: public_id, version and signature from the Cloudinary upload response
+    Requires authentication
+    """
+    try:
+        data = request.get_json() or {}
+        public_id = data.get('public_id')
+        version = data.get('version')
+        signature = data.get('signature')
+        image_format = data.get('format')
+        
+        if not public_id or not version or not signature:
+            return jsonify({"error": "public_id, version and signature are required"}), 400
+
+        if not isinstance(public_id, str) or not isinstance(signature, str):
+            return jsonify({"error": "public_id and signature must be strings"}), 400
+
+        # Cloudinary versions are integers (sent as a number or a string of digits)
+        if isinstance(version, bool) or not str(version).isdigit():
+            return jsonify({"error": "version must be an integer"}), 400
+
+        if image_format is not None and not isinstance(image_format, str):
+            return jsonify({"error": "format must be a string"}), 400
+
+        if image_format and image_format.lower() not in Config.ALLOWED_EXTENSIONS:
+            allowed_types = ', '.join(Config.ALLOWED_EXTENSIONS)
+            return jsonify({"error": f"Invalid file type. Allowed: {allowed_types}"}), 400
+        
+        # The signature proves Cloudinary created this public_id and version for our account
+        cloudinary = get_cloudinary()
+        if not cloudinary.utils.verify_api_response_signature(public_id, version, signature):
+            return jsonify({"error": "Invalid upload signature"}), 400
+        
+        # Only accept uploads made with a signature issued to this user
+        if not public_id.startswith(f"{Config.UPLOAD_FOLDER}/{current_user.id}_"):
+            return jsonify({"error": "You do not have permission to confirm this upload"}), 403
+        
+        Upload.objects(publicId=public_id).update_one(
+            upsert=True,
+            set__version=int(version),
+            set__format=image_format,
+            set__owner=current_user.id,
+            set_on_insert__createdAt=datetime.now(timezone.utc)
+        )
+        
+        image_url, _ = cloudinary.utils.cloudinary_url(
+            public_id, version=version, format=image_format, secure=True
+        )
+        
+        return jsonify({
+            "imageId": public_id,
+            "imageUrl": image_url,
+            "imageVariants": image_variants(public_id)
+        }), 201
+        
+    except Exception as err:
+        return jsonify({"error": f"Confirm failed: {str(err)}"}), 500
+
 @bp.route("info/<path:public_id>", methods=["GET"])
 @token_required
 def get_image_info(_, public_id):
@@ -122,18 +218,25 @@ def get_image_info(_, public_id):
         public_id = urllib.parse.unquote(public_id)
         print(f"Decoded public_id: {public_id}")
         
-        # Get resource info
-        result = cloudinary.api.resource(public_id)
+        # Serve from the cache shared by all workers when possible (saves an Admin API call)
+        cache = get_cache()
+        cache_key = f"image-info:{public_id}"
+        info = cache.get_json(cache_key)
+        if info is None:
+            # Get resource info
+            result = get_api().resource(public_id)
+            info = {
+                "imageId": result['public_id'],
+                "imageUrl": result['secure_url'],
+                "format": result['format'],
+                "width": result['width'],
+                "height": result['height'],
+                "bytes": result['bytes'],
+                "createdAt": result['created_at']
+            }
+            cache.set_json(cache_key, info, ttl=Config.IMAGE_INFO_CACHE_TTL_SECONDS)
         
-        return jsonify({
-            "imageId": result['public_id'],
-            "imageUrl": result['secure_url'],
-            "format": result['format'],
-            "width": result['width'],
-            "height": result['height'],
-            "bytes": result['bytes'],
-            "createdAt": result['created_at']
-        }), 200
+        return jsonify(info), 200
         
     except Exception as err:
         print(f"Error getting image info: {str(err)}")
@@ -152,7 +255,8 @@ def delete_image(_, public_id):
         print(f"Deleting image with public_id: {public_id}")
         
         # Delete from Cloudinary
-        result = cloudinary.uploader.destroy(public_id)
+        result = get_uploader().destroy(public_id)
+        get_cache().delete(f"image-info:{public_id}")
         
         if result['result'] == 'ok':
             return jsonify({
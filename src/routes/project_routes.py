@@ -1,15 +1,41 @@
-from flask import Blueprint, request, jsonify
+from functools import partial
+from flask import Blueprint, request, jsonify, make_response, Response
 from marshmallow import ValidationError
-from src.models.project import Project
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReadPreference
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.wsgi import get_input_stream
+from src.config import Config
+from src.models.project import Project, OwnerSnapshot
 from src.schemas.project_schema import ProjectSchema, ProjectInputSchema
-from src.utils.auth import token_required
+from src.schemas.compiled import compile_schema
+from src.utils.auth import token_required, get_current_user, is_admin
+from src.utils.cookies import set_sticky_primary_cookie
+from src.utils.read_routing import route_read, read_preference_for, is_sticky_primary
+from src.utils.project_stats import get_project_stats, project_snapshot, record_project_change
+from src.utils.project_events import broadcaster, can_hold_streams, publish_project_event, stream_project_events
+from src.utils.archive import (
+    find_archived_project, find_projects_with_archive, restore_archived_project, delete_archived_project
+)
+from src.utils.query_profiler import explain_list_projects
+from src.utils.singleflight import SingleFlight
+from src.utils.project_list_cache import cached_list_page, invalidate_project_lists
+from src.utils.image_variants import image_variants
+from src.utils.ndjson import EXPORT_FIELDS, export_projects_ndjson, import_projects_ndjson
 
 bp = Blueprint("projects", __name__, url_prefix="/projects")
 
 # Schema instances
 project_schema = ProjectSchema()
 projects_schema = ProjectSchema(many=True)
-input_schema = ProjectInputSchema()
+input_schema = compile_schema(ProjectInputSchema())
+
+# Coalesces identical concurrent project list requests within this worker
+list_projects_flight = SingleFlight(
+    grace_seconds=Config.SINGLEFLIGHT_GRACE_MS / 1000,
+    wait_timeout=Config.SINGLEFLIGHT_WAIT_SECONDS
+)
 
 @bp.route("/", methods=["GET"])
 def list_projects():
@@ -21,10 +47,14 @@ def list_projects():
     - skip: Skip number of results for pagination (default: 0)
     - sort: Sort by field (default: dueDate)
     - order: Sort order - 'asc' or 'desc' (default: asc)
+    - includeArchived: Also search archived projects - 'true' or 'false' (default: false)
+    - explain: Return the query plans instead of projects - '1' (admins only)
     """
     try:
         # Get query parameters
         search_query = request.args.get('search', '').strip()
+        include_archived = request.args.get('includeArchived', 'false').lower() == 'true'
+        explain = request.args.get('explain', '').lower() in ('1', 'true')
         limit = min(int(request.args.get('limit', 50)), 100)  # Max 100 results
         skip = int(request.args.get('skip', 0))
         sort_field = request.args.get('sort', 'dueDate')
@@ -53,32 +83,178 @@ def list_projects():
         # Execute query with pagination and sorting
         sort_prefix = '+' if sort_order == 'asc' else '-'
         sort_string = f"{sort_prefix}{sort_field}"
+        sort_direction = 1 if sort_order == 'asc' else -1
+        
+        if explain:
+            if not is_admin(get_current_user()):
+                return jsonify({"error": "Explain mode is only available to admins"}), 403
+            
+            return jsonify({
+                "explain": explain_list_projects(query, sort_field, sort_direction, skip, limit, include_archived),
+                "query": {"filter": query, "sort": {sort_field: sort_direction}, "skip": skip, "limit": limit},
+                "includeArchived": include_archived
+            }), 200
         
-        projects = Project.objects(__raw__=query).order_by(sort_string).skip(skip).limit(limit)
-        total_count = Project.objects(__raw__=query).count()
-        
-        # Prepare response
-        response_data = {
-            "projects": projects_schema.dump(projects),
-            "pagination": {
-                "total": total_count,
-                "limit": limit,
-                "skip": skip,
-                "hasMore": (skip + limit) < total_count
-            },
-            "sorting": {
-                "field": sort_field,
-                "order": sort_order
+        def load_page():
+            if include_archived:
+                projects, total_count = find_projects_with_archive(query, sort_field, sort_direction, skip, limit)
+            else:
+                # Hot tier only (archived projects live in projects_archive)
+                projects = route_read(Project.objects(__raw__=query), 'list_projects').order_by(sort_string).skip(skip).limit(limit)
+                total_count = route_read(Project.objects(__raw__=query), 'list_projects').count()
+            
+            # Prepare response
+            response_data = {
+                "projects": projects_schema.dump(projects),
+                "pagination": {
+                    "total": total_count,
+                    "limit": limit,
+                    "skip": skip,
+                    "hasMore": (skip + limit) < total_count
+                },
+                "sorting": {
+                    "field": sort_field,
+                    "order": sort_order
+                }
             }
+            
+            if search_query:
+                response_data["search"] = search_query
+            
+            # Serialize once, so coalesced requests share the body
+            return jsonify(response_data).get_data()
+        
+        # Identical concurrent requests share one execution, and pages may be cached for all
+        # workers (not after a write: the caller must see it)
+        if is_sticky_primary():
+            body = load_page()
+        else:
+            page_key = (search_query, include_archived, sort_field, sort_order, skip, limit)
+            load_shared_page = partial(cached_list_page, page_key, load_page)
+            if Config.SINGLEFLIGHT_ENABLED:
+                body, _ = list_projects_flight.do(page_key, load_shared_page)
+            else:
+                body = load_shared_page()
+        
+        return Response(body, status=200, mimetype='application/json')
+        
+    except ValueError as err:
+        return jsonify({"error": "Invalid pagination parameters"}), 400
+    except Exception as err:
+        return jsonify({"error": str(err)}), 500
+
+@bp.route("/stats", methods=["GET"])
+def project_stats():
+    """
+    Get project dashboard stats
+    Returns counts by status, overdue and due-this-week counts, and per-owner totals
+    """
+    try:
+        return jsonify(get_project_stats()), 200
+        
+    except Exception as err:
+        return jsonify({"error": str(err)}), 500
+
+@bp.route("/stream", methods=["GET"])
+def stream_projects():
+    """
+    Stream project changes as server-sent events
+    Query parameters:
+    - owner: Only send changes for projects of this owner ID
+    Headers:
+    - Last-Event-ID: Resume after this event (sent automatically by EventSource)
+    """
+    owner_id = request.args.get('owner', '').strip() or None
+    last_event_id = request.headers.get('Last-Event-ID')
+    
+    # A stream would block a sync worker for everyone else
+    if not can_hold_streams(request.environ):
+        return jsonify({"error": "Project streams need a threaded or gevent worker (WORKER_CLASS)"}), 503
+    
+    subscription = broadcaster.subscribe(last_event_id)
+    if subscription is None:
+        return jsonify({"error": "Too many open project streams, try again later"}), 503
+    
+    response = Response(
+        stream_project_events(subscription, owner_id=owner_id),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Disable proxy buffering (nginx)
         }
+    )
+    # Free the slot even if the client disconnects before the stream starts
+    response.call_on_close(partial(broadcaster.unsubscribe, subscription[0]))
+    return response
+
+@bp.route("/export", methods=["GET"])
+def export_projects():
+    """
+    Export projects as NDJSON (one JSON object per line), streamed from a cursor
+    Query parameters:
+    - search: Only export projects matching name or description (case-insensitive)
+    - fields: Comma separated fields to export (default: all)
+    - batchSize: Documents fetched per cursor batch (default: 1000, max: 10000)
+    - afterId: Resume an interrupted export after this project ID
+    """
+    try:
+        search_query = request.args.get('search', '').strip()
+        batch_size = min(max(int(request.args.get('batchSize', Config.EXPORT_BATCH_SIZE)), 1), 10000)
+        after_id = request.args.get('afterId', '').strip()
         
+        fields = [field.strip() for field in request.args.get('fields', '').split(',') if field.strip()]
+        invalid_fields = [field for field in fields if field not in EXPORT_FIELDS]
+        if invalid_fields:
+            return jsonify({"error": f"Invalid fields: {', '.join(invalid_fields)}. Allowed: {', '.join(EXPORT_FIELDS)}"}), 400
+        
+        query = {}
         if search_query:
-            response_data["search"] = search_query
+            query['$or'] = [
+                {'name': {'$regex': search_query, '$options': 'i'}},
+                {'description': {'$regex': search_query, '$options': 'i'}}
+            ]
+        if after_id:
+            try:
+                query['_id'] = {'$gt': ObjectId(after_id)}
+            except (InvalidId, TypeError):
+                return jsonify({"error": "Invalid afterId"}), 400
+        
+        collection = Project._get_collection().with_options(read_preference=read_preference_for('export_projects'))
         
-        return jsonify(response_data), 200
+        return Response(
+            export_projects_ndjson(collection, query, fields or EXPORT_FIELDS, batch_size),
+            mimetype='application/x-ndjson',
+            headers={'Content-Disposition': 'attachment; filename=projects.ndjson'}
+        )
         
     except ValueError as err:
-        return jsonify({"error": "Invalid pagination parameters"}), 400
+        return jsonify({"error": "Invalid export parameters"}), 400
+    except Exception as err:
+        return jsonify({"error": str(err)}), 500
+
+@bp.route("/import", methods=["POST"])
+@token_required
+def import_projects(current_user):
+    """
+    Import projects from an NDJSON body (one project per line)
+    Lines are validated like POST /projects/ and the current user becomes the owner
+    Stops after IMPORT_MAX_SECONDS; resend the lines after lastLine when complete is false
+    Requires authentication
+    """
+    try:
+        # Read the raw body incrementally, with a larger limit than MAX_CONTENT_LENGTH
+        try:
+            stream = get_input_stream(request.environ, max_content_length=Config.IMPORT_MAX_CONTENT_LENGTH)
+        except RequestEntityTooLarge:
+            return jsonify({"error": f"Import body larger than {Config.IMPORT_MAX_CONTENT_LENGTH} bytes"}), 413
+        result = import_projects_ndjson(stream, current_user, input_schema)
+        if result.inserted:
+            invalidate_project_lists()
+        
+        response = make_response(jsonify(result.to_json()), 200)
+        set_sticky_primary_cookie(response)
+        return response
+        
     except Exception as err:
         return jsonify({"error": str(err)}), 500
 
@@ -93,15 +269,24 @@ def create_project(current_user):
         # Validate input data
         data = input_schema.load(request.get_json())
         
-        # Handle owner assignment
-        print(current_user)
+        # Handle owner assignment (snapshot lets reads skip the users lookup)
         data['owner'] = current_user.id
+        data['ownerSnapshot'] = OwnerSnapshot.from_user(current_user)
+        
+        # Variant URLs of the image, generated by Cloudinary at upload time
+        data['imageVariants'] = image_variants(data.get('imageId'))
         
         # Create project
         project = Project(**data)
         project.save()
+        record_project_change(None, project_snapshot(project))
+        invalidate_project_lists()
+        publish_project_event('created', project)
         
-        return jsonify(project_schema.dump(project)), 201
+        # Keep the caller's next reads on the primary so they see this write
+        response = make_response(jsonify(project_schema.dump(project)), 201)
+        set_sticky_primary_cookie(response)
+        return response
         
     except ValidationError as err:
         return jsonify({"errors": err.messages}), 400
@@ -112,9 +297,13 @@ def create_project(current_user):
 def get_project(project_id):
     """
     Get a specific project by ID
+    Falls back to the archive for projects moved out of the hot collection
     """
     try:
-        project = Project.objects(id=project_id).first()
+        project = route_read(Project.objects(id=project_id), 'get_project').first()
+        
+        if not project:
+            project = find_archived_project(project_id)
         
         if not project:
             return jsonify({"error": "Project not found"}), 404
@@ -129,16 +318,20 @@ def get_project(project_id):
 def update_project(current_user, project_id):
     """
     Update a project (full update)
+    Archived projects are moved back to the hot collection
     Requires authentication
     """
     try:
-        # Find project
+        # Find project (writes read the archive from the primary)
         project = Project.objects(id=project_id).first()
+        archived = project is None
+        if archived:
+            project = find_archived_project(project_id, ReadPreference.PRIMARY)
         if not project:
             return jsonify({"error": "Project not found"}), 404
         
         # Check owner permission
-        if project.owner and str(project.owner.id) != str(current_user.id):
+        if project.owner_id() and project.owner_id() != str(current_user.id):
             return jsonify({"error": "You do not have permission to update this project"}), 403
 
         # Validate input data
@@ -148,14 +341,25 @@ def update_project(current_user, project_id):
         if 'owner' in data:
             del data['owner']
         
+        if archived:
+            restore_archived_project(project)
+        before = project_snapshot(project)
+        
         # Update all provided fields (except owner)
         for field, value in data.items():
             if hasattr(project, field):
                 setattr(project, field, value)
         
+        project.imageVariants = image_variants(project.imageId)
         project.save()
+        record_project_change(before, project_snapshot(project))
+        invalidate_project_lists()
+        publish_project_event('updated', project)
         
-        return jsonify(project_schema.dump(project)), 200
+        # Keep the caller's next reads on the primary so they see this write
+        response = make_response(jsonify(project_schema.dump(project)), 200)
+        set_sticky_primary_cookie(response)
+        return response
         
     except ValidationError as err:
         return jsonify({"errors": err.messages}), 400
@@ -166,23 +370,34 @@ def update_project(current_user, project_id):
 @token_required
 def delete_project(current_user, project_id):
     """
-    Delete a project
+    Delete a project (hot or archived)
     Requires authentication
     """
     try:
-        # Find project
+        # Find project (writes read the archive from the primary)
         project = Project.objects(id=project_id).first()
+        archived = project is None
+        if archived:
+            project = find_archived_project(project_id, ReadPreference.PRIMARY)
         if not project:
             return jsonify({"error": "Project not found"}), 404
         
         # Check owner permission
-        if project.owner and str(project.owner.id) != str(current_user.id):
+        if project.owner_id() and project.owner_id() != str(current_user.id):
             return jsonify({"error": "You do not have permission to delete this project"}), 403
 
         # Delete project
-        project.delete()
+        if archived:
+            delete_archived_project(project)
+        else:
+            project.delete()
+            record_project_change(project_snapshot(project), None)
+            invalidate_project_lists()
+        publish_project_event('deleted', project)
         
-        return jsonify({"message": "Project deleted successfully"}), 200
+        response = make_response(jsonify({"message": "Project deleted successfully"}), 200)
+        set_sticky_primary_cookie(response)
+        return response
         
     except Exception as err:
         return jsonify({"error": str(err)}), 500
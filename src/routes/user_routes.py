@@ -2,23 +2,27 @@ from flask import Blueprint, request, jsonify, make_response
 from marshmallow import ValidationError
 from werkzeug.security import generate_password_hash, check_password_hash
 import jwt
+import uuid
 from datetime import datetime, timedelta, timezone
 from src.models.user import User
 from src.schemas.user_schema import UserSchema
 from src.schemas.auth_schema import UserRegisterSchema, UserLoginSchema
+from src.schemas.compiled import compile_schema
 from src.config import Config
-from src.utils.cookies import set_auth_cookie, clear_auth_cookie
+from src.utils.cookies import set_auth_cookie, clear_auth_cookie, set_sticky_primary_cookie
 from src.utils.auth import token_required
+from src.utils.read_routing import route_read
+from src.utils.token_denylist import denylist
 
 bp = Blueprint("users", __name__, url_prefix="/users")
 user_schema = UserSchema()
 users_schema = UserSchema(many=True)
-register_schema = UserRegisterSchema()
-login_schema = UserLoginSchema()
+register_schema = compile_schema(UserRegisterSchema())
+login_schema = compile_schema(UserLoginSchema())
 
 @bp.route("/", methods=["GET"])
 def list_users():
-    users = User.objects()
+    users = route_read(User.objects(), 'list_users')
     return jsonify(users_schema.dump(users))
 
 @bp.route("/register", methods=["POST"])
@@ -40,7 +44,9 @@ def register_user():
         new_user.save()
         
         # Return user data without password using UserSchema
-        return jsonify(user_schema.dump(new_user)), 201
+        response = make_response(jsonify(user_schema.dump(new_user)), 201)
+        set_sticky_primary_cookie(response)
+        return response
     except ValidationError as err:
         return jsonify({"errors": err.messages}), 400
     except Exception as err:
@@ -64,7 +70,8 @@ def login_user():
                 'name': user.name,
                 'email': user.email,
                 'exp': datetime.now(timezone.utc) + timedelta(days=Config.JWT_EXPIRATION_DAYS),
-                'iat': datetime.now(timezone.utc)
+                'iat': datetime.now(timezone.utc),
+                'jti': uuid.uuid4().hex  # Token id, used to revoke the token on logout
             }
             
             token = jwt.encode(payload, Config.JWT_SECRET_KEY, algorithm='HS256')
@@ -104,6 +111,18 @@ def get_current_user(current_user):
 
 @bp.route("/logout", methods=["POST"])
 def logout_user():
+    # Revoke the token server-side so it can't be reused until it expires
+    token = request.cookies.get('accessToken')
+    if token:
+        try:
+            payload = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=['HS256'])
+            if payload.get('jti'):
+                denylist.revoke(payload['jti'], datetime.fromtimestamp(payload['exp'], timezone.utc))
+        except jwt.InvalidTokenError:
+            pass  # Expired or invalid tokens don't need revoking
+        except Exception as err:
+            print(f"Error revoking token during logout: {err}")
+    
     response = make_response(jsonify({"message": "Logout successful"}), 200)
 
     # Clear authentication cookie with consistent options
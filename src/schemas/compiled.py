@@ -0,0 +1,211 @@
+"""
+Compiled validation fast path for the input schemas.
+
+compile_schema() inspects a marshmallow schema once (at import) and builds one
+specialized validation function per field, with the validators inlined
+(length checks, OneOf sets, precompiled regexes, ISO date parsing). The
+compiled schema's load() returns the same data and raises the same
+ValidationError messages as Schema.load(), without the general marshmallow
+machinery on every request.
+"""
+from collections.abc import Mapping
+from marshmallow import Schema, ValidationError, fields, validate
+from marshmallow.decorators import PRE_LOAD
+from marshmallow.utils import from_iso_date
+from src.config import Config
+
+MISSING_MESSAGE = fields.Field.default_error_messages["required"]
+NULL_MESSAGE = fields.Field.default_error_messages["null"]
+UNKNOWN_MESSAGE = Schema._default_error_messages["unknown"]
+INVALID_INPUT_MESSAGE = Schema._default_error_messages["type"]
+
+class _Invalid(Exception):
+    """Raised by a field function with the list of error messages for that field"""
+
+    def __init__(self, messages):
+        self.messages = messages
+
+def _compile_length(validator):
+    minimum, maximum, equal = validator.min, validator.max, validator.equal
+
+    def error(value, message):
+        return (validator.error or message).format(input=value, min=minimum, max=maximum, equal=equal)
+
+    if equal is not None:
+        def check(value):
+            if len(value) != equal:
+                return error(value, validator.message_equal)
+        return check
+
+    message_min = validator.message_min if maximum is None else validator.message_all
+    message_max = validator.message_max if minimum is None else validator.message_all
+
+    def check(value):
+        length = len(value)
+        if minimum is not None and length < minimum:
+            return error(value, message_min)
+        if maximum is not None and length > maximum:
+            return error(value, message_max)
+    return check
+
+def _compile_one_of(validator):
+    choices = frozenset(validator.choices)
+    choices_text, labels_text = validator.choices_text, validator.labels_text
+
+    def check(value):
+        try:
+            if value in choices:
+                return None
+        except TypeError:
+            pass
+        return validator.error.format(input=value, choices=choices_text, labels=labels_text)
+    return check
+
+def _compile_regexp(validator):
+    match = validator.regex.match
+    pattern = validator.regex.pattern
+
+    def check(value):
+        if match(value) is None:
+            return validator.error.format(input=value, regex=pattern)
+    return check
+
+def _compile_generic(validator):
+    # Validators without a specialized version (e.g. Email) are called directly
+    def check(value):
+        try:
+            validator(value)
+        except ValidationError as err:
+            return err.messages
+    return check
+
+VALIDATOR_COMPILERS = {
+    validate.Length: _compile_length,
+    validate.OneOf: _compile_one_of,
+    validate.Regexp: _compile_regexp,
+}
+
+def _compile_validator(validator):
+    compiler = VALIDATOR_COMPILERS.get(type(validator), _compile_generic)
+    return compiler(validator)
+
+def _compile_deserializer(field):
+    """Build the type conversion for a field (same rules as the field's _deserialize)"""
+    invalid_message = field.error_messages["invalid"]
+
+    if type(field) in (fields.String, fields.Email):
+        invalid_utf8_message = field.error_messages["invalid_utf8"]
+
+        def deserialize(value):
+            if isinstance(value, str):
+                return value
+            if not isinstance(value, bytes):
+                raise _Invalid([invalid_message.format(input=value)])
+            try:
+                return value.decode("utf-8")
+            except UnicodeDecodeError:
+                raise _Invalid([invalid_utf8_message.format(input=value)])
+        return deserialize
+
+    if type(field) is fields.Date and field.format in (None, "iso", "iso8601"):
+        def deserialize(value):
+            try:
+                return from_iso_date(value)
+            except (TypeError, AttributeError, ValueError):
+                raise _Invalid([invalid_message.format(input=value, obj_type="date")])
+        return deserialize
+
+    raise NotImplementedError(f"Cannot compile field type {type(field).__name__}")
+
+def _compile_field(field):
+    """Build the function that deserializes and validates one field value"""
+    deserialize = _compile_deserializer(field)
+    checks = tuple(_compile_validator(validator) for validator in field.validators)
+    allow_none = field.allow_none
+    null_message = field.error_messages.get("null", NULL_MESSAGE)
+
+    def load_field(value):
+        if value is None:
+            if allow_none:
+                return None
+            raise _Invalid([null_message])
+        value = deserialize(value)
+        errors = []
+        for check in checks:
+            message = check(value)
+            if message is None:
+                continue
+            if isinstance(message, list):
+                errors.extend(message)
+            else:
+                errors.append(message)
+        if errors:
+            raise _Invalid(errors)
+        return value
+
+    return load_field
+
+class CompiledSchema:
+    """Drop-in replacement for Schema.load() built from an existing schema instance"""
+
+    def __init__(self, schema):
+        if schema.many or schema.partial or schema.unknown != "raise":
+            raise NotImplementedError("Only single, non-partial schemas with unknown=RAISE can be compiled")
+        if schema._hooks.get((PRE_LOAD, True)) or any(
+            schema._hooks.get(hook) for hook in schema._hooks if hook[0] != PRE_LOAD
+        ):
+            raise NotImplementedError("Only @pre_load hooks can be compiled")
+
+        self.schema = schema
+        self._pre_load = tuple(getattr(schema, name) for name in schema._hooks.get((PRE_LOAD, False), []))
+        self._fields = tuple(
+            (
+                field.data_key or name,
+                field.attribute or name,
+                field.required,
+                field.error_messages.get("required", MISSING_MESSAGE),
+                _compile_field(field)
+            )
+            for name, field in schema.load_fields.items()
+        )
+        self._known_keys = frozenset(data_key for data_key, *_ in self._fields)
+
+    def load(self, data):
+        for hook in self._pre_load:
+            data = hook(data, many=False, partial=None)
+
+        if not isinstance(data, Mapping):
+            raise ValidationError({"_schema": [INVALID_INPUT_MESSAGE]}, data=data, valid_data={})
+
+        result = {}
+        errors = {}
+        for data_key, attribute, required, missing_message, load_field in self._fields:
+            if data_key not in data:
+                if required:
+                    errors[data_key] = [missing_message]
+                continue
+            try:
+                result[attribute] = load_field(data[data_key])
+            except _Invalid as err:
+                errors[data_key] = err.messages
+
+        for key in data:
+            if key not in self._known_keys:
+                errors[key] = [UNKNOWN_MESSAGE]
+
+        if errors:
+            raise ValidationError(errors, data=data, valid_data=result)
+        return result
+
+def compile_schema(schema):
+    """
+    Return a compiled version of the schema when SCHEMA_VALIDATION_BACKEND is
+    'compiled', otherwise (or if the schema uses unsupported features) the schema itself
+    """
+    if Config.SCHEMA_VALIDATION_BACKEND != "compiled":
+        return schema
+    try:
+        return CompiledSchema(schema)
+    except NotImplementedError as err:
+        print(f"🟡 Using marshmallow for {type(schema).__name__}: {err}")
+        return schema
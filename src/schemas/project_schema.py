@@ -13,9 +13,19 @@ class ProjectSchema(Schema):
     status = fields.Str(required=True, validate=validate.OneOf(["not-started", "in-progress", "completed"]))
     imageId = fields.Str(required=False, allow_none=True, validate=validate.Length(max=100))
     imageUrl = fields.Str(required=False, allow_none=True, validate=validate.Length(max=200))
-    owner = fields.Nested(OwnerSchema, required=False, allow_none=True, dump_only=True)
+    imageVariants = fields.Dict(dump_only=True)
+    imageSrcset = fields.Method("get_image_srcset", dump_only=True)
+    owner = fields.Method("get_owner", dump_only=True)
     createdAt = fields.DateTime(dump_only=True)
     updatedAt = fields.DateTime(dump_only=True)
+    archivedAt = fields.DateTime(dump_only=True)
+
+    def get_owner(self, project):
+        # Same fields as OwnerSchema, read from the embedded snapshot without a users lookup
+        return project.owner_json()
+
+    def get_image_srcset(self, project):
+        return project.image_srcset()
 
 class ProjectInputSchema(Schema):
     name = fields.Str(required=True, validate=validate.Length(min=3, max=100))
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReplaceOne, DeleteOne
+from src.config import Config
+from src.models.project import Project
+from src.utils.project_stats import project_snapshot, record_project_changes
+from src.utils.read_routing import read_preference_for
+from src.utils.project_list_cache import invalidate_project_lists
+
+ARCHIVE_COLLECTION = 'projects_archive'
+
+def archive_collection(read_preference=None):
+    """Get the raw collection holding archived (cold) projects"""
+    collection = Project._get_db()[ARCHIVE_COLLECTION]
+    if read_preference is not None:
+        collection = collection.with_options(read_preference=read_preference)
+    return collection
+
+def ensure_archive_indexes():
+    """Index the archive for the same sorts and lookups as the hot collection"""
+    collection = archive_collection()
+    collection.create_index('dueDate')
+    collection.create_index('owner')
+    collection.create_index('archivedAt')
+
+def archive_projects(older_than_days=None, statuses=None, batch_size=None):
+    """
+    Move projects matching the archive policy out of the hot collection
+    Policy: status in statuses and not updated for older_than_days days.
+    Each batch is copied with one bulk_write to the archive, then removed from the
+    hot collection with one bulk_write; a project updated in between stays hot.
+    Returns the number of projects moved.
+    """
+    older_than_days = Config.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    statuses = statuses or Config.ARCHIVE_STATUSES
+    batch_size = batch_size or Config.ARCHIVE_BATCH_SIZE
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    query = {'status': {'$in': list(statuses)}, 'updatedAt': {'$lt': cutoff}}
+    hot = Project._get_collection()
+    cold = archive_collection()
+    ensure_archive_indexes()
+    moved = 0
+
+    while True:
+        batch = list(hot.find(query).limit(batch_size))
+        if not batch:
+            return moved
+
+        archived_at = datetime.now(timezone.utc)
+        cold.bulk_write(
+            [ReplaceOne({'_id': doc['_id']}, {**doc, 'archivedAt': archived_at}, upsert=True) for doc in batch],
+            ordered=False
+        )
+        # Only delete unchanged documents, so concurrent updates are never lost
+        result = hot.bulk_write(
+            [DeleteOne({'_id': doc['_id'], 'updatedAt': doc['updatedAt']}) for doc in batch],
+            ordered=False
+        )
+
+        ids = [doc['_id'] for doc in batch]
+        if result.deleted_count < len(batch):
+            still_hot = {doc['_id'] for doc in hot.find({'_id': {'$in': ids}}, {'_id': 1})}
+            cold.delete_many({'_id': {'$in': list(still_hot)}})
+            batch = [doc for doc in batch if doc['_id'] not in still_hot]
+
+        # Stats describe the hot tier
+        record_project_changes([(project_snapshot(Project._from_son(doc)), None) for doc in batch])
+        invalidate_project_lists()
+        moved += len(batch)
+        print(f"📦 Archived {moved} projects so far")
+
+def find_archived_project(project_id, read_preference=None):
+    """Find a project in the archive by id (None if missing or invalid)"""
+    try:
+        object_id = ObjectId(project_id)
+    except (InvalidId, TypeError):
+        return None
+    read_preference = read_preference or read_preference_for('get_project')
+    doc = archive_collection(read_preference).find_one({'_id': object_id})
+    return Project._from_son(doc) if doc else None
+
+def restore_archived_project(project):
+    """
+    Move an archived project back to the hot collection (before it is updated)
+    Copied first, then removed from the archive, so it is never missing from both.
+    """
+    doc = project.to_mongo().to_dict()
+    doc.pop('archivedAt', None)
+    Project._get_collection().replace_one({'_id': doc['_id']}, doc, upsert=True)
+    archive_collection().delete_one({'_id': doc['_id']})
+    project.archivedAt = None
+    record_project_changes([(None, project_snapshot(project))])
+    invalidate_project_lists()
+
+def delete_archived_project(project):
+    """Delete a project from the archive (stats only count hot projects, so they don't change)"""
+    archive_collection().delete_one({'_id': project.id})
+    invalidate_project_lists()
+
+def archive_union_pipelines(query, sort_field, sort_direction, skip, limit):
+    """Build the page and count pipelines over the hot and archive collections ($unionWith, MongoDB 4.4+)"""
+    union = [{'$match': query}, {'$unionWith': {'coll': ARCHIVE_COLLECTION, 'pipeline': [{'$match': query}]}}]
+    page = [{'$sort': {sort_field: sort_direction, '_id': 1}}, {'$skip': skip}]
+    if limit > 0:
+        page.append({'$limit': limit})
+    return union + page, union + [{'$count': 'total'}]
+
+def find_projects_with_archive(query, sort_field, sort_direction, skip, limit):
+    """
+    Query the hot and archive collections together
+    Returns (projects, total_count)
+    """
+    page_pipeline, count_pipeline = archive_union_pipelines(query, sort_field, sort_direction, skip, limit)
+    collection = Project._get_collection().with_options(read_preference=read_preference_for('list_projects'))
+
+    docs = collection.aggregate(page_pipeline)
+    projects = [Project._from_son(doc) for doc in docs]
+
+    counts = list(collection.aggregate(count_pipeline))
+    total_count = counts[0]['total'] if counts else 0
+    return projects, total_count
@@ -3,6 +3,7 @@ from functools import wraps
 from flask import request, jsonify
 from src.config import Config
 from src.models.user import User
+from src.utils.token_denylist import denylist
 
 def token_required(f):
     """
@@ -24,6 +25,10 @@ def token_required(f):
             # Decode the token
             payload = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=['HS256'])
             
+            # Reject tokens revoked by logout (in-memory check in the common case)
+            if denylist.is_revoked(payload.get('jti')):
+                return jsonify({'error': 'Token has been revoked'}), 401
+            
             # Get the actual User object from database
             current_user = User.objects(id=payload['id']).first()
             if not current_user:
@@ -40,3 +45,24 @@ def token_required(f):
         return f(current_user, *args, **kwargs)
     
     return decorated
+
+def get_current_user():
+    """
+    Get the logged in user from the access token cookie, or None.
+    For routes that work without authentication but do more for some users.
+    """
+    token = request.cookies.get('accessToken')
+    if not token:
+        return None
+    
+    try:
+        payload = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=['HS256'])
+        if denylist.is_revoked(payload.get('jti')):
+            return None
+        return User.objects(id=payload['id']).first()
+    except Exception:
+        return None
+
+def is_admin(user):
+    """Check if a user is an admin (email listed in ADMIN_EMAILS)"""
+    return user is not None and bool(user.email) and user.email.lower() in Config.ADMIN_EMAILS
@@ -0,0 +1,274 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from src.config import Config
+
+# fcntl is POSIX only; other platforms use the in-process cache
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+class Cache(ABC):
+    """
+    Small bytes cache interface shared by the backends
+    ttl is in seconds: None uses CACHE_DEFAULT_TTL_SECONDS, 0 never expires.
+    """
+
+    @abstractmethod
+    def get(self, key):
+        """Get the bytes cached for key, or None"""
+
+    @abstractmethod
+    def set(self, key, value, ttl=None):
+        """Cache bytes for key; returns False when the value can't be cached"""
+
+    @abstractmethod
+    def delete(self, key):
+        """Remove key from the cache"""
+
+    def get_json(self, key):
+        value = self.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set_json(self, key, value, ttl=None):
+        return self.set(key, json.dumps(value, separators=(',', ':')).encode(), ttl)
+
+def _expires_at(ttl):
+    ttl = Config.CACHE_DEFAULT_TTL_SECONDS if ttl is None else ttl
+    return time.time() + ttl if ttl > 0 else 0
+
+class LocalCache(Cache):
+    """In-process LRU with TTL (one copy per worker)"""
+
+    def __init__(self, max_entries):
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        if self._max_entries <= 0:
+            return False
+        with self._lock:
+            self._entries[key] = (_expires_at(ttl), bytes(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+# Shared memory layout: a header, then slot_count fixed-size slots.
+# Slots are grouped in buckets of `ways` slots; a key can only live in its bucket.
+MAGIC = b'PSC1'
+HEADER = struct.Struct('<4sIII')  # magic, slot count, slot bytes, ways
+HEADER_BYTES = 64
+SEQ = struct.Struct('<I')  # Seqlock counter, odd while the slot is being written
+META = struct.Struct('<QddHI')  # key hash, expires at, last access, key length, value length
+SLOT_HEADER_BYTES = SEQ.size + META.size
+MAX_KEY_BYTES = 250
+SEQLOCK_RETRIES = 3
+ACCESS_RESOLUTION_SECONDS = 1.0  # Don't rewrite the access time of a slot more often
+
+class SharedMemoryCache(Cache):
+    """
+    Cache shared by all worker processes on the host, in a memory-mapped file.
+    Reads are lock-free (per-slot seqlock, retried if a write was in progress);
+    writes take one of `stripes` locks (a thread lock plus an fcntl byte-range lock).
+    Each bucket evicts its expired, then least recently used slot.
+    Values that don't fit in a slot are not cached.
+    """
+
+    def __init__(self, path, slot_count, slot_bytes, ways, stripes):
+        self._ways = ways
+        self._bucket_count = max(slot_count // ways, 1)
+        self._slot_bytes = slot_bytes
+        self._stripes = stripes
+        self._thread_locks = [threading.Lock() for _ in range(stripes)]
+        slot_count = self._bucket_count * ways
+        size = HEADER_BYTES + slot_count * slot_bytes
+
+        # The layout is part of the file name, so a file is never resized under another process
+        self.path = f"{path}-{slot_count}x{slot_bytes}"
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._mm = self._map(size, HEADER.pack(MAGIC, slot_count, slot_bytes, ways))
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _map(self, size, header):
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, 0)
+        try:
+            # Reserve the pages now: writing to a page the filesystem (e.g. a full /dev/shm)
+            # can't back kills the process with SIGBUS, while this raises OSError (ENOSPC)
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(self._fd, 0, size)
+            elif os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)
+            mm = mmap.mmap(self._fd, size)
+            if mm[:HEADER.size] != header:
+                # New (zero-filled) or unrecognized file: clear every slot header
+                empty_slot = bytes(SLOT_HEADER_BYTES)
+                for offset in range(HEADER_BYTES, size, self._slot_bytes):
+                    mm[offset:offset + SLOT_HEADER_BYTES] = empty_slot
+                mm[:HEADER.size] = header
+            return mm
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, 0)
+
+    def _locate(self, key):
+        key_bytes = key.encode()
+        if len(key_bytes) > MAX_KEY_BYTES:
+            key_bytes = hashlib.sha256(key_bytes).hexdigest().encode()
+        key_hash = int.from_bytes(hashlib.blake2b(key_bytes, digest_size=8).digest(), 'little')
+        bucket = key_hash % self._bucket_count
+        first_slot = HEADER_BYTES + bucket * self._ways * self._slot_bytes
+        offsets = [first_slot + way * self._slot_bytes for way in range(self._ways)]
+        return key_bytes, key_hash, bucket % self._stripes, offsets
+
+    @contextmanager
+    def _locked(self, stripe):
+        # fcntl locks are per process, the thread lock orders threads within one
+        with self._thread_locks[stripe]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, 1 + stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, 1 + stripe)
+
+    def _read_slot(self, offset, key_hash, key_bytes):
+        """Consistent (expires_at, value) of a slot holding key, or None"""
+        mm = self._mm
+        for _ in range(SEQLOCK_RETRIES):
+            seq, = SEQ.unpack_from(mm, offset)
+            if seq & 1:
+                continue
+            stored_hash, expires_at, _, key_length, value_length = META.unpack_from(mm, offset + SEQ.size)
+            if stored_hash != key_hash or key_length != len(key_bytes):
+                return None
+            start = offset + SLOT_HEADER_BYTES
+            data = mm[start:start + key_length + value_length]
+            if SEQ.unpack_from(mm, offset)[0] != seq:
+                continue
+            if data[:key_length] != key_bytes:
+                return None
+            return expires_at, data[key_length:]
+        return None
+
+    def _write_slot(self, offset, key_hash, expires_at, key_bytes, value):
+        mm = self._mm
+        seq, = SEQ.unpack_from(mm, offset)
+        SEQ.pack_into(mm, offset, (seq + 1) & 0xFFFFFFFF)
+        META.pack_into(mm, offset + SEQ.size, key_hash, expires_at, time.time(), len(key_bytes), len(value))
+        start = offset + SLOT_HEADER_BYTES
+        mm[start:start + len(key_bytes) + len(value)] = key_bytes + value
+        SEQ.pack_into(mm, offset, (seq + 2) & 0xFFFFFFFF)
+
+    def get(self, key):
+        key_bytes, key_hash, _, offsets = self._locate(key)
+        now = time.time()
+        for offset in offsets:
+            found = self._read_slot(offset, key_hash, key_bytes)
+            if found is None:
+                continue
+            expires_at, value = found
+            if expires_at and expires_at <= now:
+                return None
+            # Racy on purpose: the access time only orders evictions
+            accessed_at = offset + SEQ.size + 16
+            if now - struct.unpack_from('<d', self._mm, accessed_at)[0] > ACCESS_RESOLUTION_SECONDS:
+                struct.pack_into('<d', self._mm, accessed_at, now)
+            return value
+        return None
+
+    def set(self, key, value, ttl=None):
+        key_bytes, key_hash, stripe, offsets = self._locate(key)
+        value = bytes(value)
+        if SLOT_HEADER_BYTES + len(key_bytes) + len(value) > self._slot_bytes:
+            return False
+
+        now = time.time()
+        with self._locked(stripe):
+            victim, victim_rank = None, None
+            for offset in offsets:
+                stored_hash, expires_at, accessed_at, key_length, _ = META.unpack_from(self._mm, offset + SEQ.size)
+                start = offset + SLOT_HEADER_BYTES
+                if (key_length and stored_hash == key_hash
+                        and self._mm[start:start + key_length] == key_bytes):
+                    victim = offset
+                    break
+                # Empty slots first, then expired ones, then the least recently used
+                if not key_length:
+                    rank = (0, 0)
+                elif expires_at and expires_at <= now:
+                    rank = (1, expires_at)
+                else:
+                    rank = (2, accessed_at)
+                if victim_rank is None or rank < victim_rank:
+                    victim, victim_rank = offset, rank
+            self._write_slot(victim, key_hash, _expires_at(ttl), key_bytes, value)
+        return True
+
+    def delete(self, key):
+        key_bytes, key_hash, stripe, offsets = self._locate(key)
+        with self._locked(stripe):
+            for offset in offsets:
+                if self._read_slot(offset, key_hash, key_bytes) is not None:
+                    self._write_slot(offset, 0, 0, b'', b'')
+
+def _default_shared_path():
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(directory, 'project-space-cache')
+
+def _create_cache():
+    if Config.CACHE_BACKEND == 'shared' and fcntl is not None:
+        try:
+            cache = SharedMemoryCache(
+                Config.CACHE_SHARED_PATH or _default_shared_path(),
+                slot_count=Config.CACHE_SLOTS,
+                slot_bytes=Config.CACHE_SLOT_KB * 1024,
+                ways=Config.CACHE_WAYS,
+                stripes=Config.CACHE_LOCK_STRIPES
+            )
+            print(f"✅ Shared memory cache: {cache.path}")
+            return cache
+        except OSError as err:
+            print(f"🟠 Shared memory cache unavailable, using a per-worker cache: {err}")
+    return LocalCache(Config.CACHE_LOCAL_ENTRIES)
+
+_cache = None
+_cache_pid = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """Get the cache backend of this process (shared memory when available, else in-process)"""
+    global _cache, _cache_pid
+    if _cache_pid != os.getpid():
+        with _cache_lock:
+            if _cache_pid != os.getpid():
+                _cache = _create_cache()
+                _cache_pid = os.getpid()
+    return _cache
@@ -0,0 +1,45 @@
+import threading
+from src.config import Config
+
+# Cloudinary is imported and configured on first use, not when the app is imported,
+# so cold starts that never touch /files don't pay for it
+_configure_lock = threading.Lock()
+_configured = False
+
+def get_cloudinary():
+    """Import and configure the Cloudinary SDK on first use"""
+    global _configured
+    import cloudinary
+
+    if not _configured:
+        with _configure_lock:
+            if not _configured:
+                cloudinary.config(
+                    cloud_name=Config.CLOUDINARY_CLOUD_NAME,
+                    api_key=Config.CLOUDINARY_API_KEY,
+                    api_secret=Config.CLOUDINARY_API_SECRET,
+                    secure=True
+                )
+                _configured = True
+    return cloudinary
+
+def get_uploader():
+    """Get the configured cloudinary.uploader module"""
+    get_cloudinary()
+    import cloudinary.uploader
+    return cloudinary.uploader
+
+def get_api():
+    """Get the configured cloudinary.api module"""
+    get_cloudinary()
+    import cloudinary.api
+    return cloudinary.api
+
+def warm_up():
+    """
+    Import and configure Cloudinary now instead of on first use
+    Called by gunicorn in the master when preload_app is on, so forked and
+    recycled workers inherit it instead of importing it again
+    """
+    get_uploader()
+    get_api()
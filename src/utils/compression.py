@@ -0,0 +1,144 @@
+import gzip
+import hashlib
+import threading
+from flask import request
+from src.config import Config
+from src.utils.cache import get_cache
+
+# Optional encoders: brotli and zstd are used when their packages are installed.
+# They are imported on the first compressed response, not when the app is imported
+_encoders = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'text/html',
+    'text/plain',
+    'text/css',
+    'text/csv',
+    'application/javascript',
+    'application/x-ndjson',
+}
+
+def _gzip(data, level):
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+def _brotli(data, level):
+    import brotli
+    return brotli.compress(data, quality=level)
+
+_zstd_compressors = threading.local()
+
+def _zstd(data, level):
+    # ZstdCompressor is not thread safe, keep one per thread and level
+    compressors = getattr(_zstd_compressors, 'by_level', None)
+    if compressors is None:
+        compressors = _zstd_compressors.by_level = {}
+    if level not in compressors:
+        import zstandard
+        compressors[level] = zstandard.ZstdCompressor(level=level)
+    return compressors[level].compress(data)
+
+def available_encoders():
+    """
+    Encoders in server preference order: {encoding: (compress function, level)}
+    The optional packages are looked up on the first call
+    """
+    global _encoders
+    if _encoders is None:
+        encoders = {}
+        try:
+            import brotli
+            encoders['br'] = (_brotli, Config.COMPRESSION_BROTLI_LEVEL)
+        except ImportError:
+            pass
+        try:
+            import zstandard
+            encoders['zstd'] = (_zstd, Config.COMPRESSION_ZSTD_LEVEL)
+        except ImportError:
+            pass
+        encoders['gzip'] = (_gzip, Config.COMPRESSION_GZIP_LEVEL)
+        _encoders = encoders
+    return _encoders
+
+def negotiate_encoding(accept_encoding, encoders):
+    """
+    Pick the best encoding from an Accept-Encoding header
+    Highest q-value wins; ties go to the server preference order of encoders.
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for part in accept_encoding.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if token:
+            qualities[token] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in encoders:
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def compress_body(data, encoding, encoders):
+    """
+    Compress a body, reusing a cached result for identical bodies
+    Cached bodies are shared by all workers (see src/utils/cache.py).
+    """
+    compress, level = encoders[encoding]
+    if Config.COMPRESSION_CACHE_TTL_SECONDS <= 0:
+        return compress(data, level)
+
+    cache = get_cache()
+    key = f"compressed:{encoding}:{level}:{hashlib.sha256(data).hexdigest()}"
+    body = cache.get(key)
+    if body is None:
+        body = compress(data, level)
+        cache.set(key, body, ttl=Config.COMPRESSION_CACHE_TTL_SECONDS)
+    return body
+
+def register_compression(app):
+    """Compress responses negotiated by Accept-Encoding (gzip, brotli, zstd)"""
+    if not Config.COMPRESSION_ENABLED:
+        return
+
+    @app.after_request
+    def compress_response(response):
+        if (response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or response.direct_passthrough
+                or response.is_streamed
+                or not 200 <= response.status_code < 300
+                or response.status_code == 204
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        # The response depends on Accept-Encoding even when it is sent uncompressed
+        response.vary.add('Accept-Encoding')
+
+        encoders = available_encoders()
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding', ''), encoders)
+        if not encoding:
+            return response
+
+        data = response.get_data()
+        if len(data) < Config.COMPRESSION_MIN_SIZE:
+            return response
+
+        body = compress_body(data, encoding, encoders)
+        if len(body) >= len(data):
+            return response
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    print("✅ Response compression enabled: gzip, plus br/zstd when installed")
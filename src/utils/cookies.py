@@ -35,3 +35,12 @@ def clear_auth_cookie(response):
         samesite=Config.COOKIE_SAMESITE
     )
     return response
+
+def set_sticky_primary_cookie(response):
+    """
+    Set a short-lived cookie so the caller's next reads go to the primary
+    (read-after-write consistency while secondaries catch up)
+    """
+    cookie_options = get_cookie_options(max_age=Config.STICKY_PRIMARY_SECONDS)
+    response.set_cookie('readPrimary', '1', **cookie_options)
+    return response
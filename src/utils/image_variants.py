@@ -0,0 +1,74 @@
+from pymongo import UpdateOne
+from src.config import Config
+from src.models.project import Project
+from src.utils.cloudinary_client import get_cloudinary
+
+def variant_transformations():
+    """Eager transformations of the variant profile: [(name, format, transformation)]"""
+    return [
+        (name, image_format, {
+            'width': width,
+            'height': height,
+            'crop': 'fill',
+            'gravity': 'auto',
+            'quality': Config.IMAGE_VARIANT_QUALITY,
+            'format': image_format
+        })
+        for name, (width, height) in Config.IMAGE_VARIANTS.items()
+        for image_format in Config.IMAGE_VARIANT_FORMATS
+    ]
+
+def eager_upload_options():
+    """Upload options that make Cloudinary generate every variant at upload time"""
+    return {
+        'eager': [transformation for _, _, transformation in variant_transformations()],
+        'eager_async': Config.IMAGE_EAGER_ASYNC
+    }
+
+def eager_upload_params():
+    """Eager options serialized for a signed direct upload (the browser sends them as-is)"""
+    cloudinary = get_cloudinary()
+    params = {'eager': cloudinary.utils.build_eager(eager_upload_options()['eager'])}
+    if Config.IMAGE_EAGER_ASYNC:
+        params['eager_async'] = 'true'
+    return params
+
+def image_variants(image_id):
+    """
+    URLs of the variants of an image, {name: {width, height, <format>: url}}
+    Built locally with the same transformations as the eager upload, so they point
+    at the derived images Cloudinary already generated (no API call).
+    """
+    if not image_id or not Config.IMAGE_VARIANTS or not Config.CLOUDINARY_CLOUD_NAME:
+        return None
+
+    cloudinary = get_cloudinary()
+    variants = {}
+    for name, image_format, transformation in variant_transformations():
+        url, _ = cloudinary.utils.cloudinary_url(image_id, secure=True, **transformation)
+        variant = variants.setdefault(name, {'width': transformation['width'], 'height': transformation['height']})
+        variant[image_format] = url
+    return variants
+
+def backfill_image_variants(batch_size=500):
+    """Add variant URLs to projects with an image but no (or outdated) variants"""
+    collection = Project._get_collection()
+    last_id = None
+    updated = 0
+
+    while True:
+        query = {'imageId': {'$nin': [None, '']}}
+        if last_id is not None:
+            query['_id'] = {'$gt': last_id}
+        batch = list(collection.find(query, {'imageId': 1, 'imageVariants': 1}).sort('_id', 1).limit(batch_size))
+        if not batch:
+            return updated
+        last_id = batch[-1]['_id']
+
+        requests = []
+        for project in batch:
+            variants = image_variants(project['imageId'])
+            if variants != project.get('imageVariants'):
+                requests.append(UpdateOne({'_id': project['_id']}, {'$set': {'imageVariants': variants}}))
+        if requests:
+            updated += collection.bulk_write(requests, ordered=False).modified_count
@@ -0,0 +1,194 @@
+import json
+import time
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+from marshmallow import ValidationError
+from pymongo.errors import BulkWriteError
+from werkzeug.exceptions import RequestEntityTooLarge
+from src.config import Config
+from src.models.project import Project, OwnerSnapshot
+from src.utils.project_stats import project_snapshot, record_project_changes
+from src.utils.image_variants import image_variants
+
+EXPORT_FIELDS = ['name', 'description', 'dueDate', 'status', 'imageId', 'imageUrl', 'imageVariants', 'owner', 'createdAt', 'updatedAt']
+
+# Keys written by the export that the import ignores (the importing user becomes the owner,
+# image variants are computed again from imageId). 'id' is kept so retries are idempotent.
+EXPORT_ONLY_KEYS = {'owner', 'createdAt', 'updatedAt', 'archivedAt', 'imageVariants'}
+
+DUPLICATE_KEY_ERROR = 11000
+
+def _export_value(field, value, doc):
+    if field == 'owner':
+        snapshot = doc.get('ownerSnapshot')
+        if snapshot:
+            return {key: snapshot.get(key) for key in ('id', 'name', 'email')}
+        return {"id": str(value)} if value is not None else None
+    if field == 'dueDate' and isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def export_projects_ndjson(collection, query, fields, batch_size):
+    """
+    Stream projects as NDJSON lines straight from a server-side cursor
+    Only batch_size raw documents are held in memory at a time.
+    """
+    projection = {field: 1 for field in fields}
+    if 'owner' in fields:
+        projection['ownerSnapshot'] = 1
+
+    cursor = collection.find(query, projection, batch_size=batch_size, sort=[('_id', 1)])
+    try:
+        for doc in cursor:
+            line = {"id": str(doc['_id'])}
+            for field in fields:
+                line[field] = _export_value(field, doc.get(field), doc)
+            yield json.dumps(line) + "\n"
+    finally:
+        cursor.close()
+
+class ImportResult:
+    """Counts and per-line errors of an import (errors capped at IMPORT_MAX_ERRORS)"""
+
+    def __init__(self):
+        self.inserted = 0
+        self.skipped = 0  # Lines whose id already exists (imported by an earlier attempt)
+        self.failed = 0
+        self.errors = []
+        self.errors_truncated = False
+        self.complete = True
+        self.last_line = 0
+
+    def add_error(self, line_number, errors):
+        self.failed += 1
+        if len(self.errors) < Config.IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line_number, "errors": errors})
+        else:
+            self.errors_truncated = True
+
+    def to_json(self):
+        return {
+            "inserted": self.inserted,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errorsTruncated": self.errors_truncated,
+            "complete": self.complete,
+            "lastLine": self.last_line
+        }
+
+def _read_lines(stream):
+    """Yield (line number, bytes) from a binary stream without reading it all"""
+    line_number = 0
+    while True:
+        line = stream.readline(Config.IMPORT_MAX_LINE_BYTES)
+        if not line:
+            return
+        line_number += 1
+        if len(line) == Config.IMPORT_MAX_LINE_BYTES and not line.endswith(b"\n"):
+            # Skip the rest of an oversized line
+            while line and not line.endswith(b"\n"):
+                line = stream.readline(Config.IMPORT_MAX_LINE_BYTES)
+            yield line_number, None
+            continue
+        yield line_number, line
+
+def _insert_chunk(projects, line_numbers, result):
+    """Insert one chunk with an unordered insert_many and map failures back to lines"""
+    docs = [project.to_mongo().to_dict() for project in projects]
+    try:
+        Project._get_collection().insert_many(docs, ordered=False)
+        inserted = projects
+    except BulkWriteError as err:
+        failed_indexes = set()
+        for write_error in err.details.get('writeErrors', []):
+            failed_indexes.add(write_error['index'])
+            if write_error.get('code') == DUPLICATE_KEY_ERROR:
+                result.skipped += 1
+                continue
+            result.add_error(line_numbers[write_error['index']], {"_schema": [write_error.get('errmsg', 'Write failed')]})
+        inserted = [project for index, project in enumerate(projects) if index not in failed_indexes]
+
+    result.inserted += len(inserted)
+    record_project_changes([(None, project_snapshot(project)) for project in inserted])
+
+def _parse_line(line_number, line, current_user, owner_snapshot, schema, result):
+    """Validate one import line into an unsaved Project, or record its error and return None"""
+    if line is None:
+        result.add_error(line_number, {"_schema": [f"Line longer than {Config.IMPORT_MAX_LINE_BYTES} bytes"]})
+        return None
+    if not line.strip():
+        return None
+
+    try:
+        data = json.loads(line)
+    except ValueError:
+        result.add_error(line_number, {"_schema": ["Invalid JSON"]})
+        return None
+
+    project_id = None
+    if isinstance(data, dict):
+        data = {key: value for key, value in data.items() if key not in EXPORT_ONLY_KEYS}
+        project_id = data.pop('id', None)
+        if project_id is not None:
+            try:
+                project_id = ObjectId(project_id)
+            except (InvalidId, TypeError):
+                result.add_error(line_number, {"id": ["Not a valid project ID."]})
+                return None
+
+    try:
+        data = schema.load(data)
+    except ValidationError as err:
+        result.add_error(line_number, err.messages)
+        return None
+    except Exception as err:
+        result.add_error(line_number, {"_schema": [str(err)]})
+        return None
+
+    data['owner'] = current_user.id
+    data['ownerSnapshot'] = owner_snapshot
+    data['imageVariants'] = image_variants(data.get('imageId'))
+    if project_id is not None:
+        data['id'] = project_id
+    return Project(**data)
+
+def import_projects_ndjson(stream, current_user, schema):
+    """
+    Import projects from an NDJSON stream, one project per line
+    Lines are validated with the project input schema and inserted in chunks of
+    IMPORT_CHUNK_SIZE, so memory use doesn't grow with the size of the body.
+    Stops after IMPORT_MAX_SECONDS (before the gunicorn timeout) or when a chunked body
+    goes over the size limit, with complete=False and the chunks read so far inserted;
+    lines with an "id" are skipped when already imported, so retries are safe.
+    """
+    result = ImportResult()
+    owner_snapshot = OwnerSnapshot.from_user(current_user)
+    projects, line_numbers = [], []
+    deadline = time.monotonic() + Config.IMPORT_MAX_SECONDS
+
+    try:
+        for line_number, line in _read_lines(stream):
+            if time.monotonic() >= deadline:
+                result.complete = False
+                break
+            result.last_line = line_number
+            project = _parse_line(line_number, line, current_user, owner_snapshot, schema, result)
+            if project is None:
+                continue
+            projects.append(project)
+            line_numbers.append(line_number)
+
+            if len(projects) >= Config.IMPORT_CHUNK_SIZE:
+                _insert_chunk(projects, line_numbers, result)
+                projects, line_numbers = [], []
+    except RequestEntityTooLarge:
+        # Bodies without a Content-Length are only cut off while reading
+        result.complete = False
+
+    if projects:
+        _insert_chunk(projects, line_numbers, result)
+    return result
@@ -0,0 +1,70 @@
+import threading
+from pymongo import UpdateOne
+from src.models.project import Project, OwnerSnapshot
+from src.models.user import User
+from src.utils.archive import archive_collection
+from src.utils.project_list_cache import invalidate_project_lists
+
+def refresh_owner_snapshots(user_id):
+    """
+    Rewrite the owner snapshot of every project owned by the user, archived ones included
+    Copies the user as currently stored; snapshots of a newer version of the user are left alone,
+    so concurrent refreshes (threads, workers) can finish in any order.
+    """
+    user = User.objects(id=user_id).only('name', 'email', 'updatedAt').first()
+    if user is None:
+        return 0
+
+    snapshot = OwnerSnapshot.from_user(user)
+    query = {'owner': user.id, 'ownerSnapshot.updatedAt': {'$not': {'$gte': user.updatedAt}}}
+    update = {'$set': {'ownerSnapshot': snapshot.to_mongo().to_dict()}}
+    modified = 0
+    for collection in (Project._get_collection(), archive_collection()):
+        modified += collection.update_many(query, update).modified_count
+    if modified:
+        invalidate_project_lists()
+    return modified
+
+def schedule_owner_snapshot_refresh(user):
+    """Fan out a user's new name/email to their projects in a background thread"""
+    user_id = user.id
+
+    def run():
+        try:
+            modified = refresh_owner_snapshots(user_id)
+            print(f"✅ Updated owner snapshot on {modified} projects for user {user_id}")
+        except Exception as err:
+            print(f"🔴 Failed to update owner snapshots for user {user_id}: {err}")
+
+    threading.Thread(target=run, daemon=True).start()
+
+def backfill_owner_snapshots(batch_size=500):
+    """
+    Add owner snapshots to projects created before snapshots existed
+    Works in batches: one users query and one bulk_write per batch
+    """
+    collection = Project._get_collection()
+    query = {'ownerSnapshot': None, 'owner': {'$ne': None}}
+    updated = 0
+
+    while True:
+        batch = list(collection.find(query, {'owner': 1}).limit(batch_size))
+        if not batch:
+            return updated
+
+        owner_ids = {project['owner'] for project in batch}
+        users = {user.id: user for user in User.objects(id__in=list(owner_ids)).only('name', 'email', 'updatedAt')}
+
+        requests = []
+        for project in batch:
+            user = users.get(project['owner'])
+            # Projects whose owner no longer exists get an id-only snapshot, so they aren't retried
+            snapshot = OwnerSnapshot.from_user(user) if user else OwnerSnapshot(id=str(project['owner']))
+            requests.append(UpdateOne(
+                {'_id': project['_id']},
+                {'$set': {'ownerSnapshot': snapshot.to_mongo().to_dict()}}
+            ))
+
+        result = collection.bulk_write(requests, ordered=False)
+        updated += result.modified_count
+        invalidate_project_lists()
@@ -0,0 +1,274 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque, OrderedDict
+from pymongo.errors import OperationFailure, PyMongoError
+from src.config import Config
+from src.models.project import Project
+
+CHANGE_STREAM_PIPELINE = [
+    {'$match': {'operationType': {'$in': ['insert', 'update', 'replace', 'delete']}}}
+]
+
+# Worker classes that keep serving other requests while a stream is open
+CONCURRENT_WORKER_CLASSES = {'gthread', 'gevent', 'eventlet', 'tornado'}
+
+# Project ids -> owner ids remembered for delete events (bounded)
+OWNER_CACHE_SIZE = 10000
+
+EVENT_TYPES = {
+    'insert': 'created',
+    'update': 'updated',
+    'replace': 'updated',
+    'delete': 'deleted',
+}
+
+def _serialize_project(project):
+    """Serialize a project the same way the REST routes do"""
+    from src.schemas.project_schema import ProjectSchema
+    return ProjectSchema().dump(project)
+
+class ProjectEventBroadcaster:
+    """
+    Fan out project changes to all SSE subscribers of this worker.
+    One MongoDB change stream is shared by every subscriber; when change streams
+    are unavailable (standalone mongod) the mutating routes publish events instead.
+    """
+
+    def __init__(self, buffer_size):
+        self._buffer_size = buffer_size
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._recent = deque(maxlen=self._buffer_size)
+        self._mode = None
+        self._pid = os.getpid()
+        # Local event ids are unique to this process, so a Last-Event-ID from another
+        # worker (or from before a restart) is never mistaken for one of ours
+        self._instance = f"{os.getpid():x}{int(time.time() * 1000):x}"
+        self._sequence = 0
+        self._resume_token = None
+        self._owners = OrderedDict()
+
+    @property
+    def mode(self):
+        return self._mode
+
+    def max_streams(self):
+        """Streams this worker may hold; thread pool workers keep one thread free for other requests"""
+        if uses_thread_pool():
+            return min(Config.SSE_MAX_STREAMS_PER_WORKER, max(Config.THREADS - 1, 0))
+        return Config.SSE_MAX_STREAMS_PER_WORKER
+
+    def _watch(self, **kwargs):
+        """Open the change stream, with delete pre-images when the server supports them (6.0+)"""
+        collection = Project._get_collection()
+        try:
+            return collection.watch(
+                CHANGE_STREAM_PIPELINE, full_document='updateLookup',
+                full_document_before_change='whenAvailable', **kwargs
+            )
+        except OperationFailure:
+            return collection.watch(CHANGE_STREAM_PIPELINE, full_document='updateLookup', **kwargs)
+
+    def _remember_owner(self, project_id, owner_id):
+        with self._lock:
+            if owner_id is None:
+                return self._owners.pop(project_id, None)
+            self._owners[project_id] = owner_id
+            self._owners.move_to_end(project_id)
+            while len(self._owners) > OWNER_CACHE_SIZE:
+                self._owners.popitem(last=False)
+            return owner_id
+
+    def _ensure_started(self):
+        """Start the change stream on first use in this process (threads don't survive fork)"""
+        if self._pid != os.getpid():
+            self._reset()
+        if self._mode is not None:
+            return
+
+        with self._lock:
+            if self._mode is not None:
+                return
+            try:
+                stream = self._watch()
+            except PyMongoError as err:
+                print(f"🟡 Change streams unavailable, using in-process events: {err}")
+                self._mode = 'local'
+                return
+
+            self._mode = 'change_stream'
+            thread = threading.Thread(target=self._run_change_stream, args=(stream,), daemon=True)
+            thread.start()
+
+    def _run_change_stream(self, stream):
+        """Read the shared change stream and reconnect from the last resume token on errors"""
+        while True:
+            try:
+                with stream:
+                    for change in stream:
+                        self._resume_token = change['_id']
+                        self._dispatch(change['_id']['_data'], self._change_to_event(change))
+            except PyMongoError as err:
+                print(f"🔴 Project change stream error, resuming: {err}")
+                time.sleep(1)
+
+            try:
+                stream = self._watch(resume_after=self._resume_token)
+            except PyMongoError as err:
+                print(f"🔴 Could not reopen project change stream: {err}")
+                time.sleep(5)
+
+    def _change_to_event(self, change):
+        """Convert a change stream document to an event payload"""
+        event = {
+            "type": EVENT_TYPES[change['operationType']],
+            "projectId": str(change['documentKey']['_id']),
+            "ownerId": None,
+            "project": None
+        }
+        document = change.get('fullDocument')
+        if document:
+            project = Project._from_son(document)
+            event["ownerId"] = self._remember_owner(event["projectId"], project.owner_id())
+            event["project"] = _serialize_project(project)
+        elif change['operationType'] == 'delete':
+            # Owner from the pre-image (MongoDB 6.0+ with pre-images enabled) or an earlier event
+            before = change.get('fullDocumentBeforeChange')
+            cached_owner = self._remember_owner(event["projectId"], None)
+            event["ownerId"] = Project._from_son(before).owner_id() if before else cached_owner
+        return event
+
+    def _dispatch(self, event_id, event):
+        """Remember the event for Last-Event-ID replay and queue it for every subscriber"""
+        with self._lock:
+            self._recent.append((event_id, event))
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait((event_id, event))
+            except queue.Full:
+                # Slow consumer: drop it, the client reconnects with Last-Event-ID
+                self.unsubscribe(subscriber)
+
+    def publish(self, event_type, project):
+        """
+        Publish a change from a mutating route (only used without change streams)
+        Nothing is published before the first subscriber starts the broadcaster.
+        """
+        if self._pid != os.getpid() or self._mode != 'local':
+            return
+
+        with self._lock:
+            self._sequence += 1
+            event_id = f"{self._instance}-{self._sequence}"
+
+        self._dispatch(event_id, {
+            "type": event_type,
+            "projectId": str(project.id),
+            "ownerId": project.owner_id(),
+            "project": _serialize_project(project) if event_type != 'deleted' else None
+        })
+
+    def subscribe(self, last_event_id=None):
+        """
+        Register a subscriber queue
+        Returns (queue, backlog, resync) where backlog holds the events missed since
+        last_event_id, and resync is True when that id is unknown or too old to replay.
+        Returns None when this worker already holds max_streams() streams.
+        """
+        self._ensure_started()
+        subscriber = queue.Queue(maxsize=Config.SSE_SUBSCRIBER_QUEUE_SIZE)
+
+        with self._lock:
+            if len(self._subscribers) >= self.max_streams():
+                return None
+            backlog = []
+            resync = False
+            if last_event_id:
+                event_ids = [event_id for event_id, _ in self._recent]
+                if last_event_id in event_ids:
+                    backlog = list(self._recent)[event_ids.index(last_event_id) + 1:]
+                else:
+                    resync = True
+            self._subscribers.add(subscriber)
+
+        return subscriber, backlog, resync
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def is_subscribed(self, subscriber):
+        with self._lock:
+            return subscriber in self._subscribers
+
+broadcaster = ProjectEventBroadcaster(buffer_size=Config.SSE_REPLAY_BUFFER_SIZE)
+
+def publish_project_event(event_type, project):
+    """Publish a project change to SSE subscribers ('created', 'updated' or 'deleted')"""
+    try:
+        broadcaster.publish(event_type, project)
+    except Exception as err:
+        # Never fail a write because of a notification problem
+        print(f"🟠 Failed to publish project event: {err}")
+
+def format_sse(event_id, event):
+    """Format an event in the text/event-stream wire format"""
+    return f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+def uses_thread_pool():
+    """
+    Check if workers serve requests from a pool of THREADS threads
+    gunicorn silently runs the sync worker as gthread when threads > 1.
+    """
+    return Config.WORKER_CLASS == 'gthread' or (Config.WORKER_CLASS == 'sync' and Config.THREADS > 1)
+
+def can_hold_streams(environ):
+    """
+    Check if this worker can keep a stream open while serving other requests
+    A sync worker would be blocked by each stream, so streams need threads or greenlets.
+    """
+    return (bool(environ.get('wsgi.multithread')) or uses_thread_pool()
+            or Config.WORKER_CLASS in CONCURRENT_WORKER_CLASSES)
+
+def stream_project_events(subscription, owner_id=None):
+    """
+    Generate SSE messages for one subscription (from broadcaster.subscribe)
+    The stream ends after SSE_MAX_STREAM_SECONDS, before the gunicorn timeout;
+    the browser reconnects with Last-Event-ID and resumes.
+    """
+    subscriber, backlog, resync = subscription
+    deadline = time.monotonic() + Config.SSE_MAX_STREAM_SECONDS
+
+    def matches(event):
+        # Events of unknown owner (e.g. some deletes) only go to unfiltered streams
+        return not owner_id or event["ownerId"] == owner_id
+
+    try:
+        yield f"retry: {Config.SSE_RETRY_MS}\n\n"
+        if resync:
+            yield "event: resync\ndata: {}\n\n"
+        for event_id, event in backlog:
+            if matches(event):
+                yield format_sse(event_id, event)
+
+        while time.monotonic() < deadline:
+            timeout = min(Config.SSE_HEARTBEAT_SECONDS, max(deadline - time.monotonic(), 0))
+            try:
+                event_id, event = subscriber.get(timeout=timeout)
+            except queue.Empty:
+                if not broadcaster.is_subscribed(subscriber):
+                    break
+                yield ": keepalive\n\n"
+                continue
+            if matches(event):
+                yield format_sse(event_id, event)
+    finally:
+        broadcaster.unsubscribe(subscriber)
@@ -0,0 +1,53 @@
+import json
+import time
+import zlib
+from src.config import Config
+from src.utils.cache import get_cache
+
+GENERATION_KEY = 'projects:list:generation'
+
+# Pages are stored zlib compressed: JSON pages shrink ~10x even at the fastest level,
+# so a default 50 project page (~30KB) fits in a cache slot (~2KB)
+COMPRESSION_LEVEL = 1
+# Report pages too large for a slot on the first skip, then every this many
+OVERSIZE_LOG_EVERY = 100
+
+oversize_skips = 0  # Pages not cached by this worker because they didn't fit in a slot
+
+def _skipped_oversize(body, compressed):
+    global oversize_skips
+    oversize_skips += 1
+    if oversize_skips % OVERSIZE_LOG_EVERY == 1:
+        print(f"🟠 Project list page not cached: {len(compressed)} bytes compressed "
+              f"({len(body)} raw) is over CACHE_SLOT_KB={Config.CACHE_SLOT_KB} "
+              f"({oversize_skips} skipped by this worker)")
+
+def _generation(cache):
+    generation = cache.get(GENERATION_KEY)
+    return generation.decode() if generation is not None else '0'
+
+def cached_list_page(params, load_page):
+    """
+    Serve a serialized GET /projects/ page from the shared cache, or load and cache it
+    Disabled unless PROJECT_LIST_CACHE_TTL_SECONDS is set.
+    """
+    ttl = Config.PROJECT_LIST_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return load_page()
+
+    cache = get_cache()
+    key = f"projects:list-z:{_generation(cache)}:{json.dumps(params)}"
+    compressed = cache.get(key)
+    if compressed is not None:
+        return zlib.decompress(compressed)
+
+    body = load_page()
+    compressed = zlib.compress(body, COMPRESSION_LEVEL)
+    if not cache.set(key, compressed, ttl=ttl):
+        _skipped_oversize(body, compressed)
+    return body
+
+def invalidate_project_lists():
+    """Start a new generation of cached list pages after projects change (old pages expire on their own)"""
+    if Config.PROJECT_LIST_CACHE_TTL_SECONDS > 0:
+        get_cache().set(GENERATION_KEY, str(time.time_ns()).encode(), ttl=0)
@@ -0,0 +1,208 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pymongo import ReturnDocument, UpdateOne
+from src.config import Config
+from src.models.project import Project
+from src.models.project_stats import ProjectStats
+from src.models.user import User
+from src.utils.read_routing import route_read
+
+SUMMARY_ID = 'global'
+STATUSES = ["not-started", "in-progress", "completed"]
+
+# Summary maps keyed by owner id or due date: keys that drop to 0 are removed so they don't grow forever
+PRUNED_MAPS = ('byOwner', 'openDueDates')
+
+def _today():
+    """Start of the current UTC day (due dates are stored as midnight datetimes)"""
+    now = datetime.now(timezone.utc)
+    return datetime(now.year, now.month, now.day)
+
+def project_snapshot(project):
+    """
+    Capture the fields the summary depends on, before a project changes
+    Returns None for a missing project (create/delete)
+    """
+    if project is None:
+        return None
+    return {
+        'status': project.status,
+        'dueDate': project.dueDate.isoformat() if project.dueDate else None,
+        'owner': project.owner_id()
+    }
+
+def _snapshot_increments(snapshot, step, increments):
+    """Add the summary counters touched by one project snapshot"""
+    increments['total'] += step
+    increments[f"byStatus.{snapshot['status']}"] += step
+    if snapshot['owner']:
+        increments[f"byOwner.{snapshot['owner']}"] += step
+    if snapshot['status'] != 'completed' and snapshot['dueDate']:
+        increments[f"openDueDates.{snapshot['dueDate']}"] += step
+
+def record_project_changes(changes):
+    """
+    Apply (before, after) snapshot pairs to the materialized summary in one update
+    The summary is only created by rebuild_project_stats, so a missing summary
+    is left alone and rebuilt on the next read.
+    """
+    if not Config.PROJECT_STATS_MATERIALIZED:
+        return
+
+    increments = Counter()
+    for before, after in changes:
+        if before:
+            _snapshot_increments(before, -1, increments)
+        if after:
+            _snapshot_increments(after, 1, increments)
+
+    increments = {key: value for key, value in increments.items() if value}
+    if not increments:
+        return
+
+    collection = ProjectStats._get_collection()
+    update = {'$inc': increments, '$set': {'updatedAt': datetime.now(timezone.utc)}}
+    decremented = [key for key, value in increments.items() if value < 0 and key.split('.')[0] in PRUNED_MAPS]
+    if not decremented:
+        collection.update_one({'_id': SUMMARY_ID}, update)
+        return
+
+    summary = collection.find_one_and_update(
+        {'_id': SUMMARY_ID}, update,
+        projection={key: 1 for key in decremented},
+        return_document=ReturnDocument.AFTER
+    )
+    if not summary:
+        return
+    emptied = []
+    for key in decremented:
+        field, name = key.split('.', 1)
+        if summary.get(field, {}).get(name) == 0:
+            emptied.append(key)
+    if emptied:
+        # Only unset keys still at 0, in case a concurrent change incremented them again
+        collection.bulk_write(
+            [UpdateOne({'_id': SUMMARY_ID, key: 0}, {'$unset': {key: ''}}) for key in emptied],
+            ordered=False
+        )
+
+def record_project_change(before, after):
+    """Apply a single project change to the materialized summary"""
+    record_project_changes([(before, after)])
+
+def rebuild_project_stats():
+    """Recompute the materialized summary from the projects collection"""
+    pipeline = [
+        {'$project': {'_id': 0, 'status': 1, 'dueDate': 1, 'owner': 1}},
+        {'$facet': {
+            'byStatus': [{'$group': {'_id': '$status', 'count': {'$sum': 1}}}],
+            'byOwner': [{'$group': {'_id': '$owner', 'count': {'$sum': 1}}}],
+            'openDueDates': [
+                {'$match': {'status': {'$ne': 'completed'}, 'dueDate': {'$ne': None}}},
+                {'$group': {
+                    '_id': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$dueDate'}},
+                    'count': {'$sum': 1}
+                }}
+            ]
+        }}
+    ]
+    result = next(Project.objects.aggregate(pipeline), {})
+
+    by_status = {row['_id']: row['count'] for row in result.get('byStatus', []) if row['_id']}
+    summary = {
+        '_id': SUMMARY_ID,
+        'total': sum(by_status.values()),
+        'byStatus': by_status,
+        'byOwner': {str(row['_id']): row['count'] for row in result.get('byOwner', []) if row['_id']},
+        'openDueDates': {row['_id']: row['count'] for row in result.get('openDueDates', [])},
+        'updatedAt': datetime.now(timezone.utc)
+    }
+    ProjectStats._get_collection().replace_one({'_id': SUMMARY_ID}, summary, upsert=True)
+    return summary
+
+def _owner_totals(owner_counts):
+    """Resolve owner names for the top owners with a single users query"""
+    top_owners = sorted(owner_counts.items(), key=lambda item: item[1], reverse=True)
+    top_owners = [(owner_id, count) for owner_id, count in top_owners if count > 0]
+    top_owners = top_owners[:Config.PROJECT_STATS_TOP_OWNERS]
+
+    users = User.objects(id__in=[owner_id for owner_id, _ in top_owners]).only('name', 'email')
+    users_by_id = {str(user.id): user for user in users}
+
+    return [
+        {
+            "id": owner_id,
+            "name": users_by_id[owner_id].name if owner_id in users_by_id else None,
+            "email": users_by_id[owner_id].email if owner_id in users_by_id else None,
+            "total": count
+        }
+        for owner_id, count in top_owners
+    ]
+
+def _materialized_stats():
+    """Read the summary document (O(1)) and derive the date based counts"""
+    summary = ProjectStats._get_collection().find_one({'_id': SUMMARY_ID})
+    if not summary:
+        summary = rebuild_project_stats()
+
+    today = _today().date().isoformat()
+    week_end = (_today() + timedelta(days=7)).date().isoformat()
+    open_due_dates = summary.get('openDueDates', {})
+
+    return {
+        "total": summary.get('total', 0),
+        "byStatus": {status: summary.get('byStatus', {}).get(status, 0) for status in STATUSES},
+        "overdue": sum(count for due, count in open_due_dates.items() if due < today),
+        "dueThisWeek": sum(count for due, count in open_due_dates.items() if today <= due < week_end),
+        "owners": _owner_totals(summary.get('byOwner', {})),
+        "source": "materialized"
+    }
+
+def _aggregated_stats():
+    """Compute the stats with a single $facet pipeline over the covering index"""
+    today = _today()
+    week_end = today + timedelta(days=7)
+
+    pipeline = [
+        # Only indexed fields, so the (status, dueDate, owner) index covers the scan
+        {'$project': {'_id': 0, 'status': 1, 'dueDate': 1, 'owner': 1}},
+        {'$facet': {
+            'byStatus': [{'$group': {'_id': '$status', 'count': {'$sum': 1}}}],
+            'overdue': [
+                {'$match': {'status': {'$ne': 'completed'}, 'dueDate': {'$lt': today}}},
+                {'$count': 'count'}
+            ],
+            'dueThisWeek': [
+                {'$match': {'status': {'$ne': 'completed'}, 'dueDate': {'$gte': today, '$lt': week_end}}},
+                {'$count': 'count'}
+            ],
+            # Only the top owners leave the server (the $facet result is a single 16MB document)
+            'byOwner': [
+                {'$match': {'owner': {'$ne': None}}},
+                {'$group': {'_id': '$owner', 'count': {'$sum': 1}}},
+                {'$sort': {'count': -1}},
+                {'$limit': Config.PROJECT_STATS_TOP_OWNERS}
+            ]
+        }}
+    ]
+    queryset = route_read(Project.objects, 'project_stats')
+    result = next(queryset.aggregate(pipeline, hint='status_1_dueDate_1_owner_1'), {})
+
+    by_status = {row['_id']: row['count'] for row in result.get('byStatus', []) if row['_id']}
+    overdue = result.get('overdue') or [{'count': 0}]
+    due_this_week = result.get('dueThisWeek') or [{'count': 0}]
+
+    return {
+        "total": sum(by_status.values()),
+        "byStatus": {status: by_status.get(status, 0) for status in STATUSES},
+        "overdue": overdue[0]['count'],
+        "dueThisWeek": due_this_week[0]['count'],
+        "owners": _owner_totals({str(row['_id']): row['count'] for row in result.get('byOwner', []) if row['_id']}),
+        "source": "aggregation"
+    }
+
+def get_project_stats():
+    """Get project stats from the materialized summary or a live aggregation"""
+    if Config.PROJECT_STATS_MATERIALIZED:
+        return _materialized_stats()
+    return _aggregated_stats()
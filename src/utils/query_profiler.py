@@ -0,0 +1,275 @@
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from bson import json_util
+from mongoengine.connection import get_connection
+from pymongo import monitoring
+from src.config import Config
+from src.models.project import Project
+from src.models.slow_query import SlowQuery
+from src.utils.archive import archive_union_pipelines
+from src.utils.read_routing import read_preference_for
+
+# Commands timed by the slow-query recorder
+PROFILED_COMMANDS = {'find', 'aggregate', 'count', 'distinct', 'findAndModify', 'update', 'delete'}
+
+# Read commands that can be explained (queryPlanner verbosity doesn't run them)
+EXPLAINABLE_COMMANDS = {'find', 'aggregate', 'count', 'distinct'}
+
+# Command options kept in the shape and in explain (session, read preference, etc. are dropped)
+COMMAND_KEYS = ['filter', 'sort', 'projection', 'hint', 'skip', 'limit', 'collation',
+                'pipeline', 'query', 'key', 'updates', 'deletes', 'update', 'remove']
+
+# Values under these keys describe the query itself rather than its parameters
+STRUCTURAL_KEYS = {'sort', '$sort', 'projection', '$project', '$group', '$count', 'hint', 'coll', '$options'}
+
+WRITER_BATCH_SIZE = 100
+
+def to_json_safe(value):
+    """Convert BSON values (ObjectId, Regex, datetime...) in explain output to plain JSON"""
+    return json.loads(json_util.dumps(value))
+
+def normalize_shape(value, key=None):
+    """Replace the parameter values of a query with "?" so equivalent queries share a shape"""
+    if key in STRUCTURAL_KEYS:
+        return to_json_safe(value)
+    if isinstance(value, dict):
+        return {item_key: normalize_shape(item, item_key) for item_key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [normalize_shape(item) for item in value]
+        # $in lists and the like: the number of values doesn't change the shape
+        return ['?'] if items and all(item == '?' for item in items) else items
+    return '?'
+
+def query_shape(command_name, command):
+    """Normalized shape of a command as a JSON string, and its hash"""
+    shape = {'command': command_name}
+    for key in COMMAND_KEYS:
+        if key in command:
+            shape[key] = normalize_shape(command[key], key)
+    shape_json = json.dumps(shape, sort_keys=True)
+    return shape_json, hashlib.sha1(shape_json.encode()).hexdigest()
+
+def explain_command(database, command, verbosity='queryPlanner', read_preference=None):
+    """Run explain for a read command ({'find': ...}, {'aggregate': ...}) and return the raw output"""
+    command_name = next(iter(command))
+    body = {command_name: command[command_name]}
+    body.update({key: command[key] for key in COMMAND_KEYS if key in command})
+    if command_name == 'aggregate':
+        body['cursor'] = {}
+    kwargs = {'read_preference': read_preference} if read_preference is not None else {}
+    return database.command({'explain': body, 'verbosity': verbosity}, **kwargs)
+
+def _explain_sections(explain_output):
+    """Find queryPlanner and executionStats in find and aggregate explain output"""
+    if 'queryPlanner' in explain_output:
+        return explain_output['queryPlanner'], explain_output.get('executionStats')
+    for stage in explain_output.get('stages', []):
+        cursor = stage.get('$cursor')
+        if cursor and 'queryPlanner' in cursor:
+            return cursor['queryPlanner'], cursor.get('executionStats')
+    return None, None
+
+def _plan_stages(plan):
+    """Flatten a plan tree into its stages, top stage first"""
+    stages, stack = [], [plan]
+    while stack:
+        stage = stack.pop()
+        stages.append(stage)
+        if 'inputStage' in stage:
+            stack.append(stage['inputStage'])
+        stack.extend(reversed(stage.get('inputStages', [])))
+    return stages
+
+def summarize_plan(explain_output, include_plan=False):
+    """
+    Summarize explain output: stage chain, indexes used, COLLSCAN and in-memory SORT flags,
+    plus docs/keys examined against documents returned when execution stats are present
+    """
+    planner, execution = _explain_sections(explain_output)
+    if planner is None:
+        return {"plan": None}
+
+    winning_plan = planner.get('winningPlan', {})
+    winning_plan = winning_plan.get('queryPlan', winning_plan)  # Slot based engine (MongoDB 5.0+)
+    stages = _plan_stages(winning_plan)
+    stage_names = [stage.get('stage') for stage in stages]
+    pipeline_stages = [next(iter(stage)) for stage in explain_output.get('stages', [])]
+
+    summary = {
+        "plan": " > ".join(name for name in stage_names if name),
+        "indexes": sorted({stage['indexName'] for stage in stages if 'indexName' in stage}),
+        "collectionScan": 'COLLSCAN' in stage_names,
+        "inMemorySort": 'SORT' in stage_names or '$sort' in pipeline_stages,
+    }
+    if execution:
+        summary.update({
+            "nReturned": execution.get('nReturned'),
+            "totalDocsExamined": execution.get('totalDocsExamined'),
+            "totalKeysExamined": execution.get('totalKeysExamined'),
+            "executionTimeMillis": execution.get('executionTimeMillis'),
+        })
+    if include_plan:
+        summary["winningPlan"] = to_json_safe(winning_plan)
+    return summary
+
+def explain_list_projects(query, sort_field, sort_direction, skip, limit, include_archived=False):
+    """
+    Explain the find and count queries of GET /projects/ with execution stats
+    Mirrors the commands the route sends (through mongoengine or the archive union).
+    """
+    collection = Project._get_collection()
+    if include_archived:
+        page_pipeline, count_pipeline = archive_union_pipelines(query, sort_field, sort_direction, skip, limit)
+        commands = {
+            'find': {'aggregate': collection.name, 'pipeline': page_pipeline},
+            'count': {'aggregate': collection.name, 'pipeline': count_pipeline},
+        }
+    else:
+        find = {'find': collection.name, 'filter': query, 'sort': {sort_field: sort_direction}, 'skip': skip}
+        if limit > 0:
+            find['limit'] = limit
+        # mongoengine counts with count_documents, or the collection metadata without a filter
+        count = ({'aggregate': collection.name, 'pipeline': [{'$match': query}, {'$group': {'_id': 1, 'n': {'$sum': 1}}}]}
+                 if query else {'count': collection.name})
+        commands = {'find': find, 'count': count}
+
+    read_preference = read_preference_for('list_projects')
+    return {
+        name: summarize_plan(
+            explain_command(collection.database, command, 'executionStats', read_preference),
+            include_plan=True
+        )
+        for name, command in commands.items()
+    }
+
+def _returned_count(command_name, reply):
+    cursor = reply.get('cursor')
+    if cursor is not None:
+        return len(cursor.get('firstBatch', []))
+    if command_name in ('count', 'update', 'delete'):
+        return reply.get('n')
+    return None
+
+class SlowQueryRecorder(monitoring.CommandListener):
+    """
+    Records commands slower than SLOW_QUERY_THRESHOLD_MS into the capped slow_queries collection
+    The listener only times commands on the request path; shapes, explains and
+    inserts happen in a background writer thread, one per worker process.
+    """
+
+    def __init__(self):
+        self._started = {}
+        self._lock = threading.Lock()
+        self._queue = None
+        self._pid = None
+        self._plans = {}  # shape hash -> (monotonic time, plan summary)
+        self.dropped = 0
+
+    def started(self, event):
+        if event.command_name not in PROFILED_COMMANDS:
+            return
+        if event.command.get(event.command_name) == SlowQuery._meta['collection']:
+            return
+        self._started[(event.connection_id, event.request_id)] = (event.database_name, event.command)
+
+    def succeeded(self, event):
+        started = self._started.pop((event.connection_id, event.request_id), None)
+        if started is None or event.duration_micros < Config.SLOW_QUERY_THRESHOLD_MS * 1000:
+            return
+        if random.random() >= Config.SLOW_QUERY_SAMPLE_RATE:
+            return
+
+        database_name, command = started
+        returned = _returned_count(event.command_name, event.reply)
+        self._enqueue((event.command_name, database_name, command, event.duration_micros, returned))
+
+    def failed(self, event):
+        self._started.pop((event.connection_id, event.request_id), None)
+
+    def _enqueue(self, item):
+        # Threads don't survive fork, so each worker starts its own writer
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue(maxsize=Config.SLOW_QUERY_QUEUE_SIZE)
+                    threading.Thread(target=self._run, args=(self._queue,), daemon=True).start()
+                    self._pid = os.getpid()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self, items):
+        while True:
+            batch = [items.get()]
+            while len(batch) < WRITER_BATCH_SIZE:
+                try:
+                    batch.append(items.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                records = [self._record(*item).to_mongo() for item in batch]
+                SlowQuery._get_collection().insert_many(records, ordered=False)
+            except Exception as err:
+                print(f"🟠 Failed to record slow queries: {err}")
+
+    def _record(self, command_name, database_name, command, duration_micros, returned):
+        shape, shape_hash = query_shape(command_name, command)
+        return SlowQuery(
+            command=command_name,
+            database=database_name,
+            collectionName=str(command.get(command_name)),
+            shape=shape,
+            shapeHash=shape_hash,
+            durationMs=duration_micros / 1000,
+            nReturned=returned,
+            plan=self._plan(command_name, database_name, command, shape_hash)
+        )
+
+    def _plan(self, command_name, database_name, command, shape_hash):
+        """Plan summary of a read, explained at most once per shape per interval"""
+        if command_name not in EXPLAINABLE_COMMANDS or not isinstance(command.get(command_name), str):
+            return None
+
+        now = time.monotonic()
+        cached = self._plans.get(shape_hash)
+        if cached and now - cached[0] < Config.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS:
+            return cached[1]
+
+        try:
+            plan = summarize_plan(explain_command(get_connection()[database_name], command))
+        except Exception as err:
+            plan = {"error": str(err)}
+
+        if len(self._plans) >= Config.SLOW_QUERY_QUEUE_SIZE:
+            self._plans.clear()
+        self._plans[shape_hash] = (now, plan)
+        return plan
+
+slow_query_recorder = SlowQueryRecorder()
+
+def top_slow_query_shapes(limit=20, since_hours=24):
+    """Slowest query shapes recorded recently, by total time spent"""
+    since = datetime.now(timezone.utc) - timedelta(hours=since_hours)
+    return list(SlowQuery._get_collection().aggregate([
+        {'$match': {'recordedAt': {'$gte': since}}},
+        {'$sort': {'recordedAt': -1}},
+        {'$group': {
+            '_id': '$shapeHash',
+            'count': {'$sum': 1},
+            'totalMs': {'$sum': '$durationMs'},
+            'avgMs': {'$avg': '$durationMs'},
+            'maxMs': {'$max': '$durationMs'},
+            'collectionName': {'$first': '$collectionName'},
+            'shape': {'$first': '$shape'},
+            'plan': {'$first': '$plan'},
+        }},
+        {'$sort': {'totalMs': -1}},
+        {'$limit': limit}
+    ]))
@@ -0,0 +1,45 @@
+from flask import request
+from pymongo.read_preferences import (
+    Primary, PrimaryPreferred, Secondary, SecondaryPreferred, Nearest
+)
+from src.config import Config
+
+READ_PREFERENCE_MODES = {
+    'primary': Primary,
+    'primaryPreferred': PrimaryPreferred,
+    'secondary': Secondary,
+    'secondaryPreferred': SecondaryPreferred,
+    'nearest': Nearest,
+}
+
+# Read preference instances are immutable, so build each mode only once
+_read_preferences = {}
+
+def get_read_preference(mode):
+    """Get the pymongo read preference for a mode name (defaults to primary)"""
+    if mode not in _read_preferences:
+        preference_class = READ_PREFERENCE_MODES.get(mode, Primary)
+        if preference_class is Primary:
+            _read_preferences[mode] = Primary()
+        else:
+            _read_preferences[mode] = preference_class(
+                max_staleness=Config.READ_MAX_STALENESS_SECONDS
+            )
+    return _read_preferences[mode]
+
+def is_sticky_primary():
+    """Check if the caller has written recently and must read from the primary"""
+    return 'readPrimary' in request.cookies
+
+def read_preference_for(route_name):
+    """
+    Get the configured read preference of a route.
+    Callers holding the sticky primary cookie always read from the primary.
+    """
+    if is_sticky_primary():
+        return get_read_preference('primary')
+    return get_read_preference(Config.READ_PREFERENCES.get(route_name, 'primary'))
+
+def route_read(queryset, route_name):
+    """Apply the configured read preference of a route to a queryset"""
+    return queryset.read_preference(read_preference_for(route_name))
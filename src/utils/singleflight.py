@@ -0,0 +1,68 @@
+import threading
+import time
+
+# Sweep finished calls once this many keys are tracked
+SWEEP_THRESHOLD = 64
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.expires_at = 0
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one execution.
+    The first caller runs the function; callers arriving while it runs (or within
+    grace_seconds after it finished) wait for and share its result or exception.
+    Only uses threading primitives, which gevent patches, so it works with both
+    threaded and gevent workers. Coalescing is per worker process.
+    """
+
+    def __init__(self, grace_seconds=0, wait_timeout=None):
+        self._grace_seconds = grace_seconds
+        self._wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, function):
+        """Run function() once for concurrent callers of key. Returns (result, shared)"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None or (call.done.is_set() and time.monotonic() >= call.expires_at):
+                if len(self._calls) >= SWEEP_THRESHOLD:
+                    self._sweep()
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            if call.done.wait(self._wait_timeout):
+                if call.error is not None:
+                    raise call.error
+                return call.result, True
+            # The leader is taking too long, don't queue behind it any longer
+            return function(), False
+
+        try:
+            call.result = function()
+        except Exception as err:
+            call.error = err
+            raise
+        finally:
+            grace = 0 if call.error is not None else self._grace_seconds
+            call.expires_at = time.monotonic() + grace
+            call.done.set()
+            if grace <= 0:
+                with self._lock:
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+        return call.result, False
+
+    def _sweep(self):
+        now = time.monotonic()
+        for key, call in list(self._calls.items()):
+            if call.done.is_set() and now >= call.expires_at:
+                del self._calls[key]
@@ -0,0 +1,137 @@
+import hashlib
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pymongo.errors import DuplicateKeyError
+from src.config import Config
+from src.models.revoked_token import RevokedToken
+
+# createdAt is stamped by the MongoDB server ($currentDate), so every app host is
+# ordered by the same clock. Re-read a few seconds of already seen revocations on every
+# refresh, so an entry stamped just before another but committed after it isn't skipped
+REFRESH_OVERLAP = timedelta(seconds=5)
+EPOCH = datetime(1970, 1, 1)
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives, rare false positives)"""
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.capacity = capacity
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class TokenDenylist:
+    """
+    Per-worker snapshot of revoked token ids (jti).
+    The Bloom filter answers "not revoked" from memory; only possible hits
+    (revoked tokens or rare false positives) are confirmed against MongoDB.
+    New revocations are pulled incrementally every TOKEN_DENYLIST_REFRESH_SECONDS,
+    and the filter is rebuilt from scratch periodically to drop expired entries.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._bloom = None
+        self._watermark = None
+        self._last_refresh = 0
+        self._last_rebuild = 0
+
+    def _rebuild(self):
+        now = datetime.now(timezone.utc)
+        collection = RevokedToken._get_collection()
+        active_count = collection.count_documents({'expiresAt': {'$gt': now}})
+        bloom = BloomFilter(
+            max(Config.TOKEN_DENYLIST_CAPACITY, active_count * 2),
+            Config.TOKEN_DENYLIST_ERROR_RATE
+        )
+        watermark = None
+        for entry in collection.find({'expiresAt': {'$gt': now}}, {'jti': 1, 'createdAt': 1, '_id': 0}):
+            bloom.add(entry['jti'])
+            if watermark is None or entry['createdAt'] > watermark:
+                watermark = entry['createdAt']
+
+        self._bloom = bloom
+        # Without entries, start from the epoch rather than this host's clock: the next refresh
+        # then picks up whatever is revoked, and the watermark follows the server's clock
+        self._watermark = watermark or EPOCH
+        self._last_rebuild = self._last_refresh = time.monotonic()
+        self._pid = os.getpid()
+
+    def _refresh(self):
+        collection = RevokedToken._get_collection()
+        query = {'createdAt': {'$gte': self._watermark - REFRESH_OVERLAP}}
+        for entry in collection.find(query, {'jti': 1, 'createdAt': 1, '_id': 0}):
+            self._bloom.add(entry['jti'])
+            if entry['createdAt'] > self._watermark:
+                self._watermark = entry['createdAt']
+        self._last_refresh = time.monotonic()
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if (self._bloom is not None and self._pid == os.getpid()
+                and now - self._last_refresh < Config.TOKEN_DENYLIST_REFRESH_SECONDS):
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            try:
+                if (self._bloom is None or self._pid != os.getpid()
+                        or now - self._last_rebuild >= Config.TOKEN_DENYLIST_REBUILD_SECONDS
+                        or self._bloom.count > self._bloom.capacity):
+                    self._rebuild()
+                elif now - self._last_refresh >= Config.TOKEN_DENYLIST_REFRESH_SECONDS:
+                    self._refresh()
+            except Exception as err:
+                # Keep serving from the last snapshot and try again on a later request
+                print(f"🟠 Failed to refresh token denylist: {err}")
+                self._last_refresh = now
+                if self._bloom is None:
+                    raise
+
+    def is_revoked(self, jti):
+        """Check if a token id has been revoked (in-memory in the common case)"""
+        if not jti:
+            return False
+        self._ensure_fresh()
+        if jti not in self._bloom:
+            return False
+        return RevokedToken.objects(jti=jti).only('jti').first() is not None
+
+    def revoke(self, jti, expires_at):
+        """Revoke a token id until the token expires"""
+        try:
+            # The server's clock stamps createdAt, which refreshes use as their watermark
+            RevokedToken._get_collection().update_one(
+                {'jti': jti},
+                {'$setOnInsert': {'expiresAt': expires_at}, '$currentDate': {'createdAt': True}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            pass  # Revoked concurrently
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+denylist = TokenDenylist()